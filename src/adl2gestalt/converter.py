@@ -1,28 +1,118 @@
 """Main conversion logic from MEDM to Gestalt."""
 
 import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import Any, Dict, Final, FrozenSet, Iterable, List, Optional, Tuple
 
-from .parser import MedmMainWidget
+from .parser import Color, MedmMainWidget
 from .widget_mapper import (
+    UNSUPPORTED_WIDGETS,
     WIDGET_TYPE_MAP,
 )
 
 logger = logging.getLogger(__name__)
 
+# MEDM text alignment to Gestalt alignment
+ALIGNMENT_MAP: Final[Dict[str, str]] = {
+    "horiz. left": "Left",
+    "horiz. centered": "Center",
+    "horiz. right": "Right",
+}
+
+# MEDM number format to Gestalt format
+FORMAT_MAP: Final[Dict[str, str]] = {
+    "decimal": "Decimal",
+    "exponential": "Exponential",
+    "engr. notation": "Engineering",
+    "compact": "Compact",
+    "hexadecimal": "Hexadecimal",
+    "string": "String",
+    "binary": "Binary",
+}
+
+# MEDM line style to Gestalt border-style
+BORDER_STYLE_MAP: Final[Dict[str, str]] = {
+    "solid": "Solid",
+    "dash": "Dashed",
+}
+
+# MEDM bar/slider directions that make the Gestalt widget vertical
+VERTICAL_DIRECTIONS: Final[FrozenSet[str]] = frozenset({"up", "down"})
+
+# Gestalt shapes that can be filled or outlined
+CLOSED_SHAPES: Final[FrozenSet[str]] = frozenset(
+    {"Arc", "Ellipse", "Rectangle", "Polygon"}
+)
+
+# Characters replaced when deriving Gestalt node names
+_TITLE_NAME_TABLE: Final = str.maketrans({" ": "_", "/": "_", ":": None})
+_SYMBOL_NAME_TABLE: Final = str.maketrans({" ": "_"})
+
+# Two-digit lowercase hex for each color component value
+_HEX256: Final[Tuple[str, ...]] = tuple(f"{i:02x}" for i in range(256))
+
+# MEDM calc expression tokens and their Python equivalents.
+# MEDM uses: # (not equal), = (equal), && (and), || (or), ! (not)
+# Comparison operators that already are valid Python map to themselves.
+# Python math functions need to be prefixed with math. in the Calc node.
+_MEDM_TOKENS: Final[Dict[str, str]] = {
+    "#": "!=",
+    "=": "==",
+    "==": "==",
+    "!=": "!=",
+    "<=": "<=",
+    ">=": ">=",
+    "&&": " and ",
+    "||": " or ",
+    "!": " not ",
+    "ABS": "abs",
+    "SQR": "math.sqrt",  # MEDM SQR is square root
+    "MIN": "min",
+    "MAX": "max",
+    "CEIL": "math.ceil",
+    "FLOOR": "math.floor",
+    "LOGE": "math.log",  # MEDM LOGE is natural logarithm
+    "LOG": "math.log10",  # MEDM LOG is base-10 logarithm
+    "EXP": "math.exp",
+    "SINH": "math.sinh",
+    "SIN": "math.sin",
+    "ASIN": "math.asin",
+    "COSH": "math.cosh",
+    "COS": "math.cos",
+    "ACOS": "math.acos",
+    "TANH": "math.tanh",
+    "TAN": "math.tan",
+    "ATAN": "math.atan",
+}
+
+# Single-pass tokenizer: two-character operators are tried before their
+# one-character prefixes, function names only match as whole words.
+_MEDM_TOKEN_RE: Final = re.compile(
+    r"[<>!=]=|&&|\|\||[#=!]|\b(?:"
+    + "|".join(name for name in _MEDM_TOKENS if name.isalpha())
+    + r")\b"
+)
+
 
 class MedmToGestaltConverter:
     """Convert MEDM ADL files to Gestalt YAML format."""
 
-    def __init__(self):
+    def __init__(self) -> None:
         """Initialize converter with widget mappings."""
         self.widget_map = WIDGET_TYPE_MAP
-        self.color_map = {}
-        self.color_aliases = {}
-        self.converted_widgets = []
+        self.color_map: List[str] = []
+        self._color_index: Dict[Any, int] = {}
+        self.color_aliases: Dict[str, str] = {}
+        self._color_ref_cache: Dict[Any, str] = {}
+        self.converted_widgets: List[Any] = []
         self.calc_node_counter = 0
-        self.calc_nodes = []
+        self.calc_nodes: List[Dict[str, str]] = []
+        self._property_handlers = self._build_property_handlers()
 
     def convert_file(self, adl_path: Path, output_path: Optional[Path] = None) -> Path:
         """
@@ -45,7 +135,7 @@ class MedmToGestaltConverter:
             raise FileNotFoundError(f"ADL file not found: {adl_path}")
 
         # Parse the ADL file
-        logger.info(f"Parsing ADL file: {adl_path}")
+        logger.info("Parsing ADL file: %s", adl_path)
         medm = MedmMainWidget(str(adl_path))
         buf = medm.getAdlLines()
         medm.parseAdlBuffer(buf)
@@ -68,13 +158,53 @@ class MedmToGestaltConverter:
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Write YAML file
-        logger.info(f"Writing Gestalt file: {output_path}")
-        with open(output_path, "w") as f:
-            # Write the content
-            f.write(gestalt_content)
+        logger.info("Writing Gestalt file: %s", output_path)
+        _write_bytes(output_path, gestalt_content.encode("utf-8"))
 
         return output_path
 
+    @classmethod
+    def convert_many(
+        cls,
+        adl_paths: Iterable[Path],
+        out_dir: Optional[Path] = None,
+        workers: Optional[int] = None,
+    ) -> List[Path]:
+        """
+        Convert several ADL files in parallel worker processes.
+
+        Each file is converted by a fresh converter, so no state is shared
+        between conversions.
+
+        Parameters
+        ----------
+        adl_paths : Iterable[Path]
+            Paths to the ADL files to convert
+        out_dir : Path, optional
+            Output directory for the YAML files. If None, each YAML file is
+            written next to its ADL file
+        workers : int, optional
+            Number of worker processes. If None, uses the number of CPUs
+
+        Returns
+        -------
+        List[Path]
+            Paths to the generated YAML files, in the order given
+        """
+        adl_paths = [Path(p) for p in adl_paths]
+        if out_dir is not None:
+            out_dir = Path(out_dir)
+            out_dir.mkdir(parents=True, exist_ok=True)
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker_logging,
+            initargs=(logging.getLogger().getEffectiveLevel(),),
+        ) as executor:
+            return list(
+                executor.map(_convert_one, adl_paths, repeat(out_dir), chunksize=8)
+            )
+
     def convert_display(self, medm: MedmMainWidget) -> str:
         """
         Convert MEDM display to Gestalt format.
@@ -93,15 +223,19 @@ class MedmToGestaltConverter:
         self.build_color_map(medm.color_table)
 
         # Set display dimensions for widget filtering
-        if hasattr(medm, "geometry") and medm.geometry:
-            self.display_width = medm.geometry.width
-            self.display_height = medm.geometry.height
+        display_geometry = medm.geometry
+        if display_geometry:
+            self.display_width = display_geometry.width
+            self.display_height = display_geometry.height
         else:
             # Default dimensions if not available
             self.display_width = 437
             self.display_height = 274
 
-        # Start building the YAML content
+        # Start building the YAML content. It is assembled as text rather than
+        # dumped with PyYAML: Gestalt files need #include preprocessor lines,
+        # custom !Node tags and the named &medm_color_N anchors, none of which
+        # a YAML emitter can reproduce.
         lines = []
 
         # Add includes first (before comments)
@@ -119,8 +253,12 @@ class MedmToGestaltConverter:
         if self.color_aliases:
             lines.append("")
             lines.append("# Custom colors from MEDM color table")
-            for alias, color in self.color_aliases.items():
-                lines.append(f"{alias}: &{alias[1:]} {color}")
+            lines.append(
+                "\n".join(
+                    f"{alias}: &{alias[1:]} {color}"
+                    for alias, color in self.color_aliases.items()
+                )
+            )
 
         lines.append("")
 
@@ -128,8 +266,10 @@ class MedmToGestaltConverter:
         lines.append("Form: !Form")
 
         # Add display geometry if available
-        if hasattr(medm, "geometry") and medm.geometry:
-            lines.append(f"    geometry: {medm.geometry.width}x{medm.geometry.height}")
+        if display_geometry:
+            lines.append(
+                f"    geometry: {display_geometry.width}x{display_geometry.height}"
+            )
 
         # Add margins (standard for Form nodes)
         lines.append("    margins: 10x0x10x10")
@@ -147,15 +287,20 @@ class MedmToGestaltConverter:
 
         lines.append("")
 
-        # Convert all widgets
+        # Convert all widgets, one entry per widget. The trailing newline
+        # yields the blank line separating widgets once lines are joined.
+        append = lines.append
+        color_table = medm.color_table
+        display_size = (self.display_width, self.display_height)
         for i, widget in enumerate(medm.widgets):
-            widget_lines = self.convert_widget_to_lines(widget, i, medm.color_table)
+            widget_lines = self.convert_widget_to_lines(
+                widget, i, color_table, display_size
+            )
             if widget_lines:
-                lines.extend(widget_lines)
-                lines.append("")
+                append("\n".join(widget_lines) + "\n")
 
         # Generate Calc nodes for visibility calc at the end of the file
-        if hasattr(self, "calc_nodes") and self.calc_nodes:
+        if self.calc_nodes:
             for i, calc_info in enumerate(self.calc_nodes):
                 lines.append("")
                 lines.append(f"{calc_info['name']}: !Calc")
@@ -182,18 +327,27 @@ class MedmToGestaltConverter:
         color_table : List
             List of Color namedtuples from MEDM
         """
-        self.color_map = {}
+        # Alias references by color index, and first index of each color
+        self.color_map = []
         self.color_aliases = {}
+        self._color_index = {}
+        self._color_ref_cache = {}
 
         for i, color in enumerate(color_table):
-            color_hex = f"${color.r:02x}{color.g:02x}{color.b:02x}"
+            color_hex = (
+                "$"
+                + _hex_component(color.r)
+                + _hex_component(color.g)
+                + _hex_component(color.b)
+            )
 
             # Create a custom color alias for all colors
             alias_name = f"medm_color_{i}"
             self.color_aliases[f"_{alias_name}"] = color_hex
-            self.color_map[i] = f"*{alias_name}"
+            self.color_map.append(f"*{alias_name}")
+            self._color_index.setdefault((color.r, color.g, color.b), i)
 
-    def get_color_reference(self, color, color_table: List) -> str:
+    def get_color_reference(self, color: Any, color_table: List) -> Optional[str]:
         """
         Get Gestalt color reference from MEDM color.
 
@@ -212,19 +366,36 @@ class MedmToGestaltConverter:
         if color is None:
             return None
 
-        # If it's a Color object, find its index
-        try:
-            if hasattr(color, "r"):
-                color_index = color_table.index(color)
-            else:
-                color_index = int(color)
+        # A Color object is keyed by its components, anything else by index
+        if isinstance(color, Color):
+            key: Any = (color.r, color.g, color.b)
+        else:
+            try:
+                key = int(color)
+            except (ValueError, TypeError):
+                return "$000000"
+
+        # Each display uses a small palette, resolve every color only once
+        reference = self._color_ref_cache.get(key)
+        if reference is not None:
+            return reference
+
+        color_index = self._color_index.get(key, -1) if isinstance(key, tuple) else key
+        if 0 <= color_index < len(self.color_map):
+            reference = self.color_map[color_index]
+        else:
+            reference = "$000000"
 
-            return self.color_map.get(color_index, "$000000")
-        except (ValueError, IndexError, TypeError):
-            return "$000000"
+        self._color_ref_cache[key] = reference
+        return reference
 
     def convert_widget_to_lines(
-        self, widget: Any, index: int, color_table: List
+        self,
+        widget: Any,
+        index: int,
+        color_table: List,
+        display_size: Optional[Tuple[int, int]] = None,
+        origin: Tuple[int, int] = (0, 0),
     ) -> List[str]:
         """
         Convert a MEDM widget to Gestalt YAML lines.
@@ -237,6 +408,12 @@ class MedmToGestaltConverter:
             Widget index for naming
         color_table : List
             MEDM color table
+        display_size : Tuple[int, int], optional
+            Display (width, height) used to skip off-screen widgets.
+            If None, uses the dimensions of the display being converted.
+        origin : Tuple[int, int]
+            Absolute (x, y) that the emitted geometry is relative to, the
+            position of the enclosing group for group children
 
         Returns
         -------
@@ -244,77 +421,67 @@ class MedmToGestaltConverter:
             Lines of YAML for this widget
         """
         # Skip widgets that are completely outside the display area
-        if hasattr(widget, "geometry") and widget.geometry:
-            # Get display dimensions from the converter instance
-            display_width = getattr(self, "display_width", 437)  # Default fallback
-            display_height = getattr(self, "display_height", 274)  # Default fallback
+        geom = widget.geometry
+        if geom:
+            if display_size is None:
+                # Default fallback when called outside of convert_display
+                display_size = (
+                    getattr(self, "display_width", 437),
+                    getattr(self, "display_height", 274),
+                )
+            dw, dh = display_size
+            gx, gy = geom.x - origin[0], geom.y - origin[1]
 
             # Check if widget is completely outside the display area
-            if (
-                widget.geometry.x + widget.geometry.width < 0
-                or widget.geometry.x > display_width
-                or widget.geometry.y + widget.geometry.height < 0
-                or widget.geometry.y > display_height
-            ):
-                logger.info(
-                    f"Skipping widget outside display area: {widget.symbol} at {widget.geometry.x},{widget.geometry.y}"
-                )
+            if gx + geom.width < 0 or gx > dw or gy + geom.height < 0 or gy > dh:
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "Skipping widget outside display area: %s at %d,%d",
+                        widget.symbol,
+                        gx,
+                        gy,
+                    )
                 return []
 
         widget_type = self.widget_map.get(widget.symbol)
         if widget_type is None:
-            logger.warning(
-                f"Widget type '{widget.symbol}' has no match in Gestalt - skipping"
-            )
+            if widget.symbol in UNSUPPORTED_WIDGETS:
+                logger.warning(
+                    "Widget type '%s' has no match in Gestalt - skipping",
+                    widget.symbol,
+                )
+            else:
+                logger.warning("Unknown widget type '%s' - skipping", widget.symbol)
             return []
 
         lines = []
+        contents = getattr(widget, "contents", None)
+        title = widget.title
 
         # Special handling for composite widgets with embedded files
-        if (
-            widget.symbol == "composite"
-            and hasattr(widget, "contents")
-            and widget.contents
-        ):
-            if widget.contents.get("composite file"):
-                widget_type = "Include"  # Override Group mapping for composite files
+        if widget.symbol == "composite" and contents and contents.get("composite file"):
+            widget_type = "Include"  # Override Group mapping for composite files
 
         # Generate widget name
-        widget_name = f"{widget.symbol.replace(' ', '_')}_{index}"
-        if hasattr(widget, "title") and widget.title:
+        if title:
             # Use title for naming if available and reasonable
-            safe_title = (
-                widget.title[:20].replace(" ", "_").replace("/", "_").replace(":", "")
-            )
-            widget_name = f"{safe_title}_{index}"
+            widget_name = f"{title[:20].translate(_TITLE_NAME_TABLE)}_{index}"
+        else:
+            widget_name = f"{widget.symbol.translate(_SYMBOL_NAME_TABLE)}_{index}"
 
         # Start widget definition
         lines.append(f"{widget_name}: !{widget_type}")
 
         # Add geometry if available
-        if hasattr(widget, "geometry") and widget.geometry:
-            geom = widget.geometry
+        if geom:
             # All widgets use x x y x width x height for geometry
-            lines.append(f"    geometry: {geom.x}x{geom.y}x{geom.width}x{geom.height}")
-
-        # Add colors (except for shapes which are handled in add_widget_properties_lines)
-        shapes = ["Arc", "Ellipse", "Rectangle", "Polygon"]
-        if hasattr(widget, "color") and widget.color:
-            fg_color = self.get_color_reference(widget.color, color_table)
-            if fg_color and widget_type not in shapes:
-                # Use border-color for Polyline widgets, foreground for others
-                if widget_type == "Polyline":
-                    lines.append(f"    border-color: {fg_color}")
-                else:
-                    lines.append(f"    foreground: {fg_color}")
-
-        if hasattr(widget, "background_color") and widget.background_color:
-            bg_color = self.get_color_reference(widget.background_color, color_table)
-            if bg_color and widget_type not in shapes:
-                lines.append(f"    background: {bg_color}")
+            lines.append(f"    geometry: {gx}x{gy}x{geom.width}x{geom.height}")
+
+        # Add colors
+        self._emit_colors(widget_type, widget, contents, lines, color_table)
 
         # Add widget-specific properties
-        if hasattr(widget, "contents") and widget.contents:
+        if contents:
             self.add_widget_properties_lines(widget, lines, widget_type, color_table)
 
         return lines
@@ -329,61 +496,11 @@ class MedmToGestaltConverter:
         if not medm_expression:
             return medm_expression
 
-        # Replace MEDM operators with Python equivalents
-        # MEDM uses: # (not equal), = (equal), && (and), || (or), ! (not)
-        # Python needs: !=, ==, and, or, not
-
-        # Initialize the Python expression with the MEDM expression
-        python_expr = medm_expression
-
-        # Replace != (MEDM uses #) - do this FIRST to avoid interference
-        python_expr = python_expr.replace("#", "!=")
-        python_expr = python_expr.replace("!=", "___NE___")
-
-        # Now do all replacements safely (___NE___ contains no special chars)
-        python_expr = python_expr.replace("=", "==")
-        python_expr = python_expr.replace(" !", " not ")
-        python_expr = python_expr.replace("! ", " not ")
-        python_expr = python_expr.replace("!", " not ")
-
-        # Finally restore # as !=
-        python_expr = python_expr.replace("___NE___", "!=")
-
-        # Replace logical operators
-        python_expr = python_expr.replace("&&", " and ")
-        python_expr = python_expr.replace("||", " or ")
-
-        # Replace MEDM mathematical functions with Python equivalents
-        # Note: Python math functions need to be prefixed with math. or imported
-        # For now, we'll use the Python math module functions
-        function_mappings = {
-            "ABS": "abs",
-            "SQR": "math.sqrt",  # MEDM SQR is square root
-            "MIN": "min",
-            "MAX": "max",
-            "CEIL": "math.ceil",
-            "FLOOR": "math.floor",
-            "LOG": "math.log10",  # MEDM LOG is base-10 logarithm
-            "LOGE": "math.log",  # MEDM LOGE is natural logarithm
-            "EXP": "math.exp",
-            "SIN": "math.sin",
-            "SINH": "math.sinh",
-            "ASIN": "math.asin",
-            "COS": "math.cos",
-            "COSH": "math.cosh",
-            "ACOS": "math.acos",
-            "TAN": "math.tan",
-            "TANH": "math.tanh",
-            "ATAN": "math.atan",
-        }
-
-        # Replace functions
-        for medm_func, python_func in function_mappings.items():
-            python_expr = python_expr.replace(medm_func.upper(), python_func)
+        return _convert_medm_to_python(medm_expression)
 
-        return python_expr
-
-    def _add_visibility_properties(self, widget, contents, lines):
+    def _add_visibility_properties(
+        self, widget: Any, contents: Dict[str, Any], lines: List[str]
+    ) -> None:
         """Add visibility properties for any widget (individual or composite)."""
 
         if "dynamic attribute" not in contents:
@@ -470,282 +587,366 @@ class MedmToGestaltConverter:
                 if "chan" in monitor:
                     lines.append(f'    pv: "{monitor["chan"]}"')
 
-        # Text widget properties
-        if widget_type == "Text" and hasattr(widget, "title"):
-            lines.append(f'    text: "{widget.title}"')
-
-        # Alignment properties
-        if widget_type in ["Text", "TextEntry"]:
-            if "align" in contents:
-                align_map = {
-                    "horiz. left": "Left",
-                    "horiz. centered": "Center",
-                    "horiz. right": "Right",
-                }
-                alignment = align_map.get(contents["align"], "Left")
-                lines.append(f"    alignment: {alignment}")
-
-        # Text entry/monitor format properties
-        if widget_type in ["TextEntry", "TextMonitor"]:
-            if "format" in contents:
-                format_map = {
-                    "decimal": "Decimal",
-                    "exponential": "Exponential",
-                    "engr. notation": "Engineering",
-                    "compact": "Compact",
-                    "hexadecimal": "Hexadecimal",
-                    "string": "String",
-                    "binary": "Binary",
-                }
-                fmt = format_map.get(contents["format"], "Decimal")
-                lines.append(f"    format: {fmt}")
-
-        # Bar/Slider properties
-        if widget_type in ["Scale", "Slider"]:
-            if "direction" in contents and contents["direction"] in ["up", "down"]:
-                lines.append("    horizontal: false")
-            else:
-                lines.append("    horizontal: true")
-
-        # Button properties
-        if widget_type in ["MessageButton"]:
-            if "label" in contents:
-                lines.append(f'    text: "{contents["label"]}"')
-            if "press_msg" in contents:
-                lines.append(f'    value: "{contents["press_msg"]}"')
-            # if "release_msg" in contents: # no release value in gestalt
-            #     lines.append(f'    release-value: "{contents["release_msg"]}"')
-
-        # Helper function to remove leading "-" from MEDM labels
-        def clean_medm_label(label):
-            """Remove leading '-' from MEDM labels to avoid folder icons"""
-            if label and label.startswith("-"):
-                return label[1:]  # Remove the leading "-"
-            return label
-
-        # Related display properties
-        if widget_type == "RelatedDisplay" and hasattr(widget, "displays"):
-            # Add text property for the button label
-            if "label" in contents:
-                clean_label = clean_medm_label(contents["label"])
-                lines.append(f'    text: "{clean_label}"')
-
-            if widget.displays:
-                lines.append("    links:")
-                for display in widget.displays:
-                    if "name" in display:
-                        label = display.get("label", display["name"])
-                        clean_label = clean_medm_label(label)
-                        macros = display.get("args", "")
-                        lines.append(
-                            f'        - {{ label: "{clean_label}", file: "{display["name"]}", macros: "{macros}" }}'
-                        )
-
-        # Shell command properties
-        if widget_type == "ShellCommand" and hasattr(widget, "commands"):
-            # Add text property for the button label
-            if "label" in contents:
-                lines.append(f'    text: "{contents["label"]}"')
-
-            if widget.commands:
-                lines.append("    commands:")
-                for cmd in widget.commands:
-                    # Shell commands use 'name' for the command, not 'command'
-                    if "name" in cmd:
-                        label = cmd.get("label", "Command")
-                        lines.append(
-                            f'        - {{ label: "{label}", command: "{cmd["name"]}" }}'
-                        )
-
-        # Polyline/Polygon points
-        if widget_type in ["Polyline", "Polygon"] and hasattr(widget, "points"):
-            if widget.points:
-                # Use original absolute geometry for points calculation if available
-                # (this preserves correct point coordinates when widget is in composite groups)
-                points_geometry = getattr(widget, "_original_geometry", widget.geometry)
-
-                # Calculate relative coordinates based on widget geometry
-                widget_x = (
-                    points_geometry.x
-                    if hasattr(points_geometry, "x") and points_geometry
-                    else 0
-                )
-                widget_y = (
-                    points_geometry.y
-                    if hasattr(points_geometry, "y") and points_geometry
-                    else 0
-                )
+        before, after = self._property_handlers.get(widget_type, ((), ()))
 
-                # Convert absolute points to relative points
-                relative_points = []
-                for p in widget.points:
-                    rel_x = p.x - widget_x
-                    rel_y = p.y - widget_y
-                    relative_points.append(f"{rel_x}x{rel_y}")
+        for handler in before:
+            handler(widget, contents, lines, color_table)
 
-                points_str = ", ".join(relative_points)
-                lines.append(f"    points: [ {points_str} ]")
+        # Visibility properties (common to all widgets)
+        self._add_visibility_properties(widget, contents, lines)
 
-        # Polyline properties - always outlined, never filled
-        if widget_type == "Polyline" and hasattr(widget, "color") and widget.color:
-            fg_color = self.get_color_reference(widget.color, color_table)
-            if fg_color:
-                # Polyline is always outlined - only border-color
-                lines.append(f"    border-color: {fg_color}")
+        for handler in after:
+            handler(widget, contents, lines, color_table)
+
+    def _emit_colors(
+        self,
+        widget_type: str,
+        widget: Any,
+        contents: Optional[Dict[str, Any]],
+        lines: List[str],
+        color_table: List,
+    ) -> None:
+        """
+        Add foreground, background and border colors for any widget.
 
-        # Closed shapes (Arc, Ellipse, Rectangle, Polygon) - can be filled or outlined
-        closed_shapes = ["Arc", "Ellipse", "Rectangle", "Polygon"]
-        if widget_type in closed_shapes and hasattr(widget, "color") and widget.color:
-            fg_color = self.get_color_reference(widget.color, color_table)
+        Closed shapes (Arc, Ellipse, Rectangle, Polygon) use their color as
+        border-color, plus background when filled. Polyline is always
+        outlined and only gets border-color.
+        """
+        color = widget.color
+        fg_color = self.get_color_reference(color, color_table) if color else None
+
+        if widget_type in CLOSED_SHAPES:
             if fg_color:
-                # Check if shape is outlined
-                is_outlined = False
-                if "basic attribute" in contents:
-                    basic_attrs = contents["basic attribute"]
-                    if (
-                        isinstance(basic_attrs, dict)
-                        and basic_attrs.get("fill") == "outline"
-                    ):
-                        is_outlined = True
-
-                if is_outlined:
-                    # For outlined shapes: only border-color, no background
-                    lines.append(f"    border-color: {fg_color}")
-                else:
-                    # For filled shapes: both background and border-color
+                basic_attrs = (contents or {}).get("basic attribute")
+                is_outlined = (
+                    isinstance(basic_attrs, dict)
+                    and basic_attrs.get("fill") == "outline"
+                )
+                if not is_outlined:
+                    # Filled shapes get both background and border-color
                     lines.append(f"    background: {fg_color}")
-                    lines.append(f"    border-color: {fg_color}")
-        # Border properties for all shapes (width and style)
-        all_shapes = ["Arc", "Ellipse", "Rectangle", "Polygon", "Polyline"]
-        if widget_type in all_shapes and "basic attribute" in contents:
+                lines.append(f"    border-color: {fg_color}")
+            return
+
+        if fg_color:
+            # Use border-color for Polyline widgets, foreground for others
+            if widget_type == "Polyline":
+                lines.append(f"    border-color: {fg_color}")
+            else:
+                lines.append(f"    foreground: {fg_color}")
+
+        background_color = widget.background_color
+        if background_color:
+            bg_color = self.get_color_reference(background_color, color_table)
+            if bg_color:
+                lines.append(f"    background: {bg_color}")
+
+    def _build_property_handlers(self) -> Dict[str, Tuple[Tuple, Tuple]]:
+        """
+        Map each Gestalt widget type to its property emitters.
+
+        Each entry holds the emitters called before and after the
+        visibility properties, in output order.
+        """
+        return {
+            "Text": ((self._emit_text,), ()),
+            "TextEntry": ((self._emit_text_entry,), ()),
+            "TextMonitor": ((self._emit_format,), ()),
+            "Scale": ((self._emit_scale,), ()),
+            "Slider": ((self._emit_scale,), ()),
+            "MessageButton": ((self._emit_message_button,), ()),
+            "RelatedDisplay": ((self._emit_related_display,), ()),
+            "ShellCommand": ((self._emit_shell_command,), ()),
+            "Polyline": ((self._emit_poly, self._emit_shape_border), ()),
+            "Polygon": ((self._emit_poly, self._emit_shape_border), ()),
+            "Ellipse": ((self._emit_shape_border,), ()),
+            "Rectangle": ((self._emit_shape_border,), ()),
+            "Arc": ((self._emit_shape_border,), (self._emit_arc,)),
+            "Image": ((self._emit_image,), ()),
+            "ByteMonitor": ((), (self._emit_byte_monitor,)),
+            "ChoiceButton": ((), (self._emit_choice_button,)),
+            "Include": ((), (self._emit_include,)),
+            "Group": ((), (self._emit_group,)),
+        }
+
+    def _emit_alignment(
+        self, widget: Any, contents: Dict[str, Any], lines: List[str], color_table: List
+    ) -> None:
+        """Add alignment for Text and TextEntry widgets."""
+        if "align" in contents:
+            alignment = ALIGNMENT_MAP.get(contents["align"], "Left")
+            lines.append(f"    alignment: {alignment}")
+
+    def _emit_format(
+        self, widget: Any, contents: Dict[str, Any], lines: List[str], color_table: List
+    ) -> None:
+        """Add number format for TextEntry and TextMonitor widgets."""
+        if "format" in contents:
+            fmt = FORMAT_MAP.get(contents["format"], "Decimal")
+            lines.append(f"    format: {fmt}")
+
+    def _emit_text(
+        self, widget: Any, contents: Dict[str, Any], lines: List[str], color_table: List
+    ) -> None:
+        """Add Text widget properties."""
+        title = widget.title
+        if title is not None:
+            lines.append(f'    text: "{title}"')
+        self._emit_alignment(widget, contents, lines, color_table)
+
+    def _emit_text_entry(
+        self, widget: Any, contents: Dict[str, Any], lines: List[str], color_table: List
+    ) -> None:
+        """Add TextEntry widget properties."""
+        self._emit_alignment(widget, contents, lines, color_table)
+        self._emit_format(widget, contents, lines, color_table)
+
+    def _emit_scale(
+        self, widget: Any, contents: Dict[str, Any], lines: List[str], color_table: List
+    ) -> None:
+        """Add Bar/Slider properties."""
+        if contents.get("direction") in VERTICAL_DIRECTIONS:
+            lines.append("    horizontal: false")
+        else:
+            lines.append("    horizontal: true")
+
+    def _emit_message_button(
+        self, widget: Any, contents: Dict[str, Any], lines: List[str], color_table: List
+    ) -> None:
+        """Add MessageButton properties."""
+        if "label" in contents:
+            lines.append(f'    text: "{contents["label"]}"')
+        if "press_msg" in contents:
+            lines.append(f'    value: "{contents["press_msg"]}"')
+        # if "release_msg" in contents: # no release value in gestalt
+        #     lines.append(f'    release-value: "{contents["release_msg"]}"')
+
+    def _emit_related_display(
+        self, widget: Any, contents: Dict[str, Any], lines: List[str], color_table: List
+    ) -> None:
+        """Add RelatedDisplay properties."""
+        displays = getattr(widget, "displays", None)
+        if displays is None:
+            return
+
+        # Add text property for the button label
+        if "label" in contents:
+            clean_label = _clean_medm_label(contents["label"])
+            lines.append(f'    text: "{clean_label}"')
+
+        if displays:
+            lines.append("    links:")
+            for display in displays:
+                if "name" in display:
+                    label = display.get("label", display["name"])
+                    clean_label = _clean_medm_label(label)
+                    macros = display.get("args", "")
+                    lines.append(
+                        f'        - {{ label: "{clean_label}", file: "{display["name"]}", macros: "{macros}" }}'
+                    )
+
+    def _emit_shell_command(
+        self, widget: Any, contents: Dict[str, Any], lines: List[str], color_table: List
+    ) -> None:
+        """Add ShellCommand properties."""
+        commands = getattr(widget, "commands", None)
+        if commands is None:
+            return
+
+        # Add text property for the button label
+        if "label" in contents:
+            lines.append(f'    text: "{contents["label"]}"')
+
+        if commands:
+            lines.append("    commands:")
+            for cmd in commands:
+                # Shell commands use 'name' for the command, not 'command'
+                if "name" in cmd:
+                    label = cmd.get("label", "Command")
+                    lines.append(
+                        f'        - {{ label: "{label}", command: "{cmd["name"]}" }}'
+                    )
+
+    def _emit_poly(
+        self, widget: Any, contents: Dict[str, Any], lines: List[str], color_table: List
+    ) -> None:
+        """Add Polyline/Polygon points."""
+        points = getattr(widget, "points", None)
+        if not points:
+            return
+
+        # Points are absolute, make them relative to the widget's own geometry
+        points_geometry = widget.geometry
+
+        # Calculate relative coordinates based on widget geometry
+        if points_geometry:
+            widget_x, widget_y = points_geometry.x, points_geometry.y
+        else:
+            widget_x = widget_y = 0
+
+        # Convert absolute points to relative points
+        relative_points = []
+        for p in points:
+            rel_x = p.x - widget_x
+            rel_y = p.y - widget_y
+            relative_points.append(f"{rel_x}x{rel_y}")
+
+        points_str = ", ".join(relative_points)
+        lines.append(f"    points: [ {points_str} ]")
+
+    def _emit_shape_border(
+        self, widget: Any, contents: Dict[str, Any], lines: List[str], color_table: List
+    ) -> None:
+        """Add border width and style for all shapes."""
+        if "basic attribute" in contents:
             basic_attrs = contents["basic attribute"]
             if isinstance(basic_attrs, dict):
                 if "width" in basic_attrs:
                     lines.append(f'    border-width: {basic_attrs["width"]}')
                 if "style" in basic_attrs:
                     # Map MEDM style to Gestalt border-style
-                    style_map = {
-                        "solid": "Solid",
-                        "dash": "Dashed",
-                    }
                     medm_style = basic_attrs["style"].lower()
-                    gestalt_style = style_map.get(medm_style, "Solid")
+                    gestalt_style = BORDER_STYLE_MAP.get(medm_style, "Solid")
                     lines.append(f"    border-style: {gestalt_style}")
 
-        # Image properties
-        if widget_type == "Image":
-            if "image name" in contents:
-                lines.append(f'    file: "{contents["image name"]}"')
+    def _emit_image(
+        self, widget: Any, contents: Dict[str, Any], lines: List[str], color_table: List
+    ) -> None:
+        """Add Image properties."""
+        if "image name" in contents:
+            lines.append(f'    file: "{contents["image name"]}"')
+
+    def _emit_byte_monitor(
+        self, widget: Any, contents: Dict[str, Any], lines: List[str], color_table: List
+    ) -> None:
+        """Add ByteMonitor properties."""
+        sbit = int(contents.get("sbit", 15))
+        ebit = int(contents.get("ebit", 0))
+        # Calculate number of bits to display
+        num_bits = abs(sbit - ebit) + 1
+        # Use the smaller value as start-bit
+        start_bit = min(sbit, ebit)
+        lines.append(f"    bits: {num_bits}")
+        lines.append(f"    start-bit: {start_bit}")
+        # Map colors - widget.color is the on-color, widget.background_color is the off-color
+        color = getattr(widget, "color", None)
+        if color:
+            on_color = self.get_color_reference(color, color_table)
+            lines.append(f"    on-color: {on_color}")
+        background_color = getattr(widget, "background_color", None)
+        if background_color:
+            off_color = self.get_color_reference(background_color, color_table)
+            lines.append(f"    off-color: {off_color}")
+
+    def _emit_choice_button(
+        self, widget: Any, contents: Dict[str, Any], lines: List[str], color_table: List
+    ) -> None:
+        """Add ChoiceButton properties."""
+        if not isinstance(contents, dict):
+            return
+        if "stacking" in contents:
+            lines.append("    horizontal: True")
+        else:
+            lines.append("    horizontal: False")
 
-        # Visibility properties (common to all widgets)
-        self._add_visibility_properties(widget, contents, lines)
+    def _emit_arc(
+        self, widget: Any, contents: Dict[str, Any], lines: List[str], color_table: List
+    ) -> None:
+        """Add Arc angles."""
+        if "beginAngle" in contents:
+            # Convert to integer to avoid float issues
+            angle = int(float(contents["beginAngle"]))
+            lines.append(f"    start-angle: {angle}")
+        if "pathAngle" in contents:
+            # Convert to integer to avoid float issues
+            span = int(float(contents["pathAngle"]))
+            lines.append(f"    span: {span}")
+
+    def _emit_include(
+        self, widget: Any, contents: Dict[str, Any], lines: List[str], color_table: List
+    ) -> None:
+        """Add Include properties (for composite widgets with embedded files)."""
+        if contents.get("composite file"):
+            # Remove .adl extension if present, as IncludeNode will add the correct extension
+            composite_file = contents["composite file"]
+            if composite_file.endswith(".adl"):
+                composite_file = composite_file[:-4]  # Remove .adl extension
+            lines.append(f'    file: "{composite_file}"')
+
+    def _emit_group(
+        self, widget: Any, contents: Dict[str, Any], lines: List[str], color_table: List
+    ) -> None:
+        """Add Composite/Group children."""
+        children = getattr(widget, "widgets", None)
+        if not children:
+            return
 
-        # ByteMonitor properties
-        if widget_type == "ByteMonitor":
-            sbit = int(contents.get("sbit", 15))
-            ebit = int(contents.get("ebit", 0))
-            # Calculate number of bits to display
-            num_bits = abs(sbit - ebit) + 1
-            # Use the smaller value as start-bit
-            start_bit = min(sbit, ebit)
-            lines.append(f"    bits: {num_bits}")
-            lines.append(f"    start-bit: {start_bit}")
-            # Map colors - widget.color is the on-color, widget.background_color is the off-color
-            if hasattr(widget, "color") and widget.color:
-                on_color = self.get_color_reference(widget.color, color_table)
-                lines.append(f"    on-color: {on_color}")
-            if hasattr(widget, "background_color") and widget.background_color:
-                off_color = self.get_color_reference(
-                    widget.background_color, color_table
-                )
-                lines.append(f"    off-color: {off_color}")
+        # Recursively convert child widgets
+        lines.append("    children:")
+
+        # Get the group's absolute position
+        group_geometry = getattr(widget, "geometry", None)
+        if group_geometry:
+            group_x, group_y = group_geometry.x, group_geometry.y
+        else:
+            group_x = group_y = 0
+
+        # Children are emitted relative to the group's absolute position
+        origin = (group_x, group_y)
+        for i, child in enumerate(children):
+            child_lines = self.convert_widget_to_lines(
+                child, i, color_table, origin=origin
+            )
+
+            if child_lines:
+                # Indent child lines
+                lines.extend(["        " + line for line in child_lines])
+
+
+@lru_cache(maxsize=256)
+def _convert_medm_to_python(medm_expression: str) -> str:
+    """Rewrite MEDM calc tokens, cached since displays repeat expressions."""
+    # Plain expressions such as "A" or "A+1" need no rewriting; search()
+    # stops at the first token, so it only costs a full scan when sub()
+    # would be skipped
+    if not _MEDM_TOKEN_RE.search(medm_expression):
+        return medm_expression
+
+    return _MEDM_TOKEN_RE.sub(
+        lambda match: _MEDM_TOKENS[match.group(0)], medm_expression
+    )
+
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    """Write data to path with one unbuffered write in the common case."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+
+
+def _convert_one(adl_path: Path, out_dir: Optional[Path]) -> Path:
+    """Convert one ADL file in a worker process."""
+    return MedmToGestaltConverter().convert_file(adl_path, out_dir)
+
+
+def _init_worker_logging(level: int) -> None:
+    """Match the parent process log level in a conversion worker."""
+    logging.basicConfig(level=level, format="%(levelname)s: %(message)s")
+    logging.getLogger().setLevel(level)
+
+
+def _clean_medm_label(label: str) -> str:
+    """Remove leading '-' from MEDM labels to avoid folder icons"""
+    if label and label.startswith("-"):
+        return label[1:]  # Remove the leading "-"
+    return label
 
-        # Choice button properties
-        if widget_type == "ChoiceButton" and isinstance(contents, dict):
-            if "stacking" in contents:
-                lines.append("    horizontal: True")
-            else:
-                lines.append("    horizontal: False")
-
-        # Arc properties
-        if widget_type == "Arc":
-            if "beginAngle" in contents:
-                # Convert to integer to avoid float issues
-                angle = int(float(contents["beginAngle"]))
-                lines.append(f"    start-angle: {angle}")
-            if "pathAngle" in contents:
-                # Convert to integer to avoid float issues
-                span = int(float(contents["pathAngle"]))
-                lines.append(f"    span: {span}")
-
-        # Include properties (for composite widgets with embedded files)
-        if widget_type == "Include" and hasattr(widget, "contents") and widget.contents:
-            if widget.contents.get("composite file"):
-                # Remove .adl extension if present, as IncludeNode will add the correct extension
-                composite_file = widget.contents["composite file"]
-                if composite_file.endswith(".adl"):
-                    composite_file = composite_file[:-4]  # Remove .adl extension
-                lines.append(f'    file: "{composite_file}"')
-
-        # Composite/Group properties
-        if widget_type == "Group" and hasattr(widget, "widgets"):
-
-            # Recursively convert child widgets
-            if widget.widgets:
-                lines.append("    children:")
-
-                # Get the group's absolute position for calculating relative child coordinates
-                group_x = (
-                    widget.geometry.x
-                    if hasattr(widget, "geometry") and widget.geometry
-                    else 0
-                )
-                group_y = (
-                    widget.geometry.y
-                    if hasattr(widget, "geometry") and widget.geometry
-                    else 0
-                )
 
-                for i, child in enumerate(widget.widgets):
-                    # Create a copy of the child with relative coordinates
-                    from .parser import Geometry
-
-                    if hasattr(child, "geometry") and child.geometry:
-                        # Calculate relative coordinates: child_absolute - group_absolute
-                        relative_x = child.geometry.x - group_x
-                        relative_y = child.geometry.y - group_y
-
-                        # Create a new geometry object with relative coordinates
-                        relative_geometry = Geometry(
-                            relative_x,
-                            relative_y,
-                            child.geometry.width,
-                            child.geometry.height,
-                        )
-
-                        # Store original geometry for points calculation
-                        original_geometry = child.geometry
-
-                        # Set original geometry attribute for points calculation
-                        child._original_geometry = original_geometry
-
-                        # Temporarily replace the child's geometry with relative coordinates
-                        child.geometry = relative_geometry
-
-                        child_lines = self.convert_widget_to_lines(
-                            child, i, color_table
-                        )
-
-                        # Restore original geometry and clean up temporary attributes
-                        child.geometry = original_geometry
-                        if hasattr(child, "_original_geometry"):
-                            delattr(child, "_original_geometry")
-                    else:
-                        child_lines = self.convert_widget_to_lines(
-                            child, i, color_table
-                        )
-
-                    if child_lines:
-                        # Indent child lines
-                        for line in child_lines:
-                            lines.append(f"        {line}")
+def _hex_component(value: int) -> str:
+    """Format a color component, clamped since dl_color blocks give any int."""
+    return _HEX256[min(max(value, 0), 255)]
@@ -4,14 +4,295 @@ Gestalt runner module for executing and validating Gestalt YAML files.
 Integrates with the local gestalt package for validation and execution.
 """
 
+import atexit
+import io
+import json
+import logging
+import mmap
+import os
+import re
 import subprocess
 import sys
 import tempfile
+import threading
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout, suppress
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from types import CodeType
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
 import yaml
 
+from . import __version__
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+logger = logging.getLogger(__name__)
+
+# Location of the bundled gestalt checkout
+_GESTALT_DIR = Path(__file__).parent.parent / "gestalt"
+
+# Import gestalt once; validation falls back to plain YAML without it
+if str(_GESTALT_DIR) not in sys.path:
+    sys.path.insert(0, str(_GESTALT_DIR))
+try:
+    import gestalt
+    from gestalt import Stylesheet
+
+    _GESTALT_IMPORT_ERROR: Optional[ImportError] = None
+    _GESTALT_VERSION = str(getattr(gestalt, "__version__", "unknown"))
+except ImportError as e:
+    Stylesheet = None
+    _GESTALT_IMPORT_ERROR = e
+    _GESTALT_VERSION = "none"
+
+# Stored with cached results; the bundled widgets and colors ship with gestalt
+_CACHE_VERSION = f"{__version__}/{_GESTALT_VERSION}"
+
+# RAM-backed directory for throwaway conversion outputs, if available (Linux)
+_TMPFS_DIR = (
+    "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+)
+
+# Serializes in-process gestalt runs, see _run_gestalt_in_process
+_GESTALT_LOCK = threading.Lock()
+
+# Matches the file names of #include lines in raw file bytes
+_INCLUDE_RE = re.compile(rb"^#include\s+(\S+)", re.MULTILINE)
+
+# Matches {NAME} and ${NAME} macro references in raw file bytes
+_MACRO_RE = re.compile(rb"\$?\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+# Test values for macros whose upper-cased name contains the substring
+_DEFAULT_RULES: Tuple[Tuple[str, str], ...] = (
+    ("PREFIX", "TEST:"),
+    ("PV", "TEST:DEVICE:VALUE"),
+    ("COLOR", "#FF0000"),
+)
+
+# Macros that are given a numeric test value
+_NUMERIC_MACROS = frozenset({"N", "INDEX", "NUM"})
+
+# Test values used for common macros
+_DEFAULT_TEST_DATA: Dict[str, Any] = {
+    "PREFIX": "TEST:",
+    "DEVICE": "DEVICE01",
+}
+
+# Output formats exercised by test_gestalt_conversion by default
+_DEFAULT_TEST_FORMATS: Tuple[str, ...] = ("qt", "bob", "dm")
+
+# Prefix of the message returned when only basic YAML validation was done
+_FALLBACK_WARNING = "Warning: Could not import gestalt for full validation"
+
+# Prefix of the message returned when the YAML itself does not parse
+_YAML_ERROR = "YAML parsing error"
+
+
+class _JsonCache:
+    """
+    Dictionary persisted as a JSON file in the user cache directory.
+
+    The file is read on first access and written back at interpreter exit
+    if anything changed. Setting ADL2GESTALT_NO_CACHE disables the cache.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._path: Optional[Path] = None
+        self._data: Optional[Dict[str, Any]] = None
+        self._changed: Set[str] = set()
+        self._dirty = False
+
+    @property
+    def path(self) -> Path:
+        # Fixed on first use, so the exit-time save goes to the same file
+        if self._path is None:
+            cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+            self._path = Path(cache_home) / "adl2gestalt" / self.filename
+        return self._path
+
+    @staticmethod
+    def enabled() -> bool:
+        return not os.environ.get("ADL2GESTALT_NO_CACHE")
+
+    def _load(self) -> Dict[str, Any]:
+        if self._data is None:
+            try:
+                with open(self.path) as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError):
+                self._data = {}
+        return self._data
+
+    def get(self, key: str) -> Any:
+        return self._load().get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        if not self._dirty:
+            atexit.register(self.save)
+            self._dirty = True
+        self._load()[key] = value
+        self._changed.add(key)
+
+    def save(self) -> None:
+        if not self._dirty or self._data is None:
+            return
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            # Keep entries other processes saved since this one loaded the file
+            try:
+                with open(self.path) as f:
+                    merged = json.load(f)
+            except (OSError, ValueError):
+                merged = {}
+            if not isinstance(merged, dict):
+                merged = {}
+            merged.update((key, self._data[key]) for key in self._changed)
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(merged, f)
+            os.replace(tmp_path, self.path)
+            self._data = merged
+            self._changed.clear()
+            self._dirty = False
+        except (OSError, TypeError, ValueError):
+            with suppress(OSError):
+                os.unlink(tmp_path)
+
+
+def _file_key(path: Path) -> Optional[Tuple[str, int, int]]:
+    """Return the (path, mtime_ns, size) cache key, or None if unavailable."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+def _include_keys(gestalt_file: Path) -> List[List[Any]]:
+    """
+    Return the cache keys of the files included by a Gestalt file.
+
+    Includes are looked up like validate_gestalt_file does, in the current
+    directory and then in the gestalt widgets directory.
+    """
+    search_path = (Path.cwd(), _GESTALT_DIR / "widgets")
+    keys = []
+    for match in _INCLUDE_RE.finditer(gestalt_file.read_bytes()):
+        name = match.group(1).decode("utf-8", errors="replace")
+        for directory in search_path:
+            key = _file_key(directory / name)
+            if key is not None:
+                keys.append(list(key))
+                break
+        else:
+            keys.append([name])
+    return keys
+
+
+class _WorkflowCache:
+    """
+    Results of successful workflow runs.
+
+    A result is reused while neither the MEDM file, the Gestalt file written
+    from it nor the files that one includes have changed since the run, the
+    same output formats are tested, and adl2gestalt and gestalt are at the
+    same versions.
+    """
+
+    def __init__(self, filename: str):
+        self._cache = _JsonCache(filename)
+
+    def get(self, medm_file: Path, gestalt_file: Path) -> Optional[Dict[str, Any]]:
+        if not _JsonCache.enabled():
+            return None
+        medm_key = _file_key(medm_file)
+        gestalt_key = _file_key(gestalt_file)
+        if medm_key is None or gestalt_key is None:
+            return None
+
+        entry = self._cache.get(medm_key[0])
+        if entry is None or entry.get("version") != _CACHE_VERSION:
+            return None
+        if entry["gestalt"] != list(gestalt_key):
+            return None
+        if entry["medm"] != list(medm_key[1:]):
+            return None
+        if entry.get("formats") != list(_DEFAULT_TEST_FORMATS):
+            return None
+        try:
+            if entry.get("includes") != _include_keys(gestalt_file):
+                return None
+        except OSError:
+            return None
+        result: Dict[str, Any] = entry["result"]
+        return result
+
+    def put(self, medm_file: Path, result: Dict[str, Any]) -> None:
+        if not _JsonCache.enabled() or not result["overall_success"]:
+            return
+        gestalt_file = Path(result["conversion"]["gestalt_file"])
+        medm_key = _file_key(medm_file)
+        gestalt_key = _file_key(gestalt_file)
+        if medm_key is None or gestalt_key is None:
+            return
+        try:
+            includes = _include_keys(gestalt_file)
+        except OSError:
+            return
+
+        # The converted outputs were temporary files, so a reused result
+        # must not name them
+        testing = {}
+        for fmt, outcome in result["testing"].items():
+            outcome = dict(outcome)
+            if outcome["success"]:
+                outcome["message"] = f"Successfully generated {fmt} output (cached)"
+                outcome["output_exists"] = False
+            testing[fmt] = outcome
+
+        entry = {
+            "version": _CACHE_VERSION,
+            "medm": list(medm_key[1:]),
+            "gestalt": list(gestalt_key),
+            "formats": list(_DEFAULT_TEST_FORMATS),
+            "includes": includes,
+            "result": dict(result, testing=testing),
+        }
+        self._cache.set(medm_key[0], entry)
+
+
+_VALIDATION_CACHE = _JsonCache("validation.json")
+_WORKFLOW_CACHE = _WorkflowCache("workflow.json")
+
+
+def _store_validation(
+    gestalt_file: Path, is_valid: bool, error_msg: Optional[str]
+) -> None:
+    """
+    Record a validation result from the full gestalt parser.
+
+    YAML-only fallback results and unexpected errors, which may come from
+    the environment rather than the file, are not recorded.
+    """
+    if Stylesheet is None or not _JsonCache.enabled():
+        return
+    if error_msg is not None and not error_msg.startswith(_YAML_ERROR):
+        return
+    key = _file_key(gestalt_file)
+    if key is not None:
+        path, mtime_ns, size = key
+        entry = [mtime_ns, size, _CACHE_VERSION, is_valid, error_msg]
+        _VALIDATION_CACHE.set(path, entry)
+
 
 def validate_gestalt_file(gestalt_file: Path) -> Tuple[bool, Optional[str]]:
     """
@@ -23,31 +304,39 @@ def validate_gestalt_file(gestalt_file: Path) -> Tuple[bool, Optional[str]]:
     Returns:
         Tuple of (is_valid, error_message)
     """
-    try:
-        # Try to import and use gestalt validation first
-        try:
-            sys.path.insert(0, str(Path(__file__).parent.parent / "gestalt"))
-            from gestalt import Stylesheet
+    # Reuse the previous result if the file is unchanged since then
+    key = _file_key(gestalt_file) if _JsonCache.enabled() else None
+    if key is not None:
+        path, mtime_ns, size = key
+        cached = _VALIDATION_CACHE.get(path)
+        if cached is not None and cached[:3] == [mtime_ns, size, _CACHE_VERSION]:
+            return cached[3], cached[4]
+
+    is_valid, error_msg = _validate_gestalt_file(gestalt_file)
+    _store_validation(gestalt_file, is_valid, error_msg)
+    return is_valid, error_msg
 
-            # Parse the stylesheet using Gestalt's parser
-            # Add the gestalt widgets directory to the include path
-            gestalt_widgets_path = str(
-                Path(__file__).parent.parent / "gestalt" / "widgets"
-            )
-            styles = Stylesheet.parse(str(gestalt_file), [".", gestalt_widgets_path])
-            return True, None
 
-        except ImportError as e:
-            # Fall back to basic YAML validation if gestalt import fails
+def _validate_gestalt_file(gestalt_file: Path) -> Tuple[bool, Optional[str]]:
+    """Validate a Gestalt YAML file without consulting the cache."""
+    try:
+        if Stylesheet is None:
+            # Fall back to basic YAML validation if gestalt import failed
             with open(gestalt_file) as f:
-                yaml_content = yaml.safe_load(f)
+                yaml_content = yaml.load(f, Loader=SafeLoader)
 
             if not yaml_content:
                 return False, "Empty YAML file"
-            return True, f"Warning: Could not import gestalt for full validation: {e}"
+            return True, f"{_FALLBACK_WARNING}: {_GESTALT_IMPORT_ERROR}"
+
+        # Parse the stylesheet using Gestalt's parser
+        # Add the gestalt widgets directory to the include path
+        gestalt_widgets_path = str(_GESTALT_DIR / "widgets")
+        Stylesheet.parse(str(gestalt_file), [".", gestalt_widgets_path])
+        return True, None
 
     except yaml.YAMLError as e:
-        return False, f"YAML parsing error: {e}"
+        return False, f"{_YAML_ERROR}: {e}"
     except Exception as e:
         return False, f"Validation error: {e}"
 
@@ -69,7 +358,7 @@ def run_gestalt_file(
         Tuple of (success, message)
     """
     try:
-        gestalt_script = Path(__file__).parent.parent / "gestalt" / "gestalt.py"
+        gestalt_script = _GESTALT_DIR / "gestalt.py"
 
         if not gestalt_script.exists():
             return False, f"Gestalt script not found at {gestalt_script}"
@@ -84,10 +373,23 @@ def run_gestalt_file(
         if output_file:
             cmd.extend(["-o", str(output_file)])
 
-        cmd.append(str(gestalt_file.resolve()))  # Convert to absolute path
+        # Absolute path without resolving symlinks, which costs a stat per part
+        cmd.append(os.path.abspath(gestalt_file))
 
-        # Run the command
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        # Run gestalt in this interpreter only if requested; if it cannot be
+        # loaded there, a subprocess still runs it and reports why
+        result = None
+        if _in_process_enabled():
+            try:
+                result = _run_gestalt_in_process(gestalt_script, cmd[2:])
+            except (ImportError, OSError, SyntaxError) as e:
+                logger.warning(
+                    "Cannot run gestalt in process, using a subprocess: %s", e
+                )
+
+        if result is None:
+            # Captured as bytes; the output is only decoded if it is reported
+            result = subprocess.run(cmd, capture_output=True)
 
         if result.returncode == 0:
             output_msg = f"Successfully generated {output_format} output"
@@ -95,18 +397,101 @@ def run_gestalt_file(
                 output_msg += f" to {output_file}"
             return True, output_msg
         else:
-            return False, f"Gestalt execution failed: {result.stderr or result.stdout}"
+            output = result.stderr or result.stdout
+            if isinstance(output, bytes):
+                output = output.decode("utf-8", errors="replace")
+            return False, f"Gestalt execution failed: {output}"
 
     except Exception as e:
         return False, f"Error running gestalt: {e}"
 
 
-def test_gestalt_conversion(gestalt_file: Path) -> Dict[str, Any]:
+def _in_process_enabled() -> bool:
+    """Whether gestalt runs in this interpreter, see _run_gestalt_in_process."""
+    return os.environ.get("ADL2GESTALT_IN_PROCESS") == "1"
+
+
+@lru_cache(maxsize=None)
+def _load_gestalt_script(gestalt_script: Path) -> CodeType:
+    """Read and compile the gestalt.py script once per process."""
+    return compile(gestalt_script.read_bytes(), str(gestalt_script), "exec")
+
+
+def _run_gestalt_in_process(
+    gestalt_script: Path, args: List[str]
+) -> subprocess.CompletedProcess:
+    """
+    Run the gestalt.py script as __main__ without starting a new interpreter.
+
+    Enabled with ADL2GESTALT_IN_PROCESS=1. Gestalt and PyYAML stay imported
+    between calls, so only the first call pays their import cost, but runs
+    also share sys.modules and any state gestalt keeps in module globals.
+    Calls are serialized with a lock because sys.argv is swapped, and the
+    standard streams are redirected process-wide, so output written by
+    other threads during a run is captured too.
+
+    A failure to import or load gestalt is raised to the caller; any other
+    exception is reported like an uncaught one in a subprocess, with the
+    traceback in stderr and return code 1.
+
+    Args:
+        gestalt_script: Path to gestalt.py
+        args: Command-line arguments for gestalt
+
+    Returns:
+        CompletedProcess with the return code and captured output
+    """
+    code = _load_gestalt_script(gestalt_script)
+    script_dir = str(gestalt_script.parent)
+    argv = [str(gestalt_script), *args]
+    stdout, stderr = io.StringIO(), io.StringIO()
+
+    with _GESTALT_LOCK:
+        if script_dir not in sys.path:
+            sys.path.insert(0, script_dir)
+
+        saved_argv = sys.argv
+        sys.argv = argv
+        try:
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                try:
+                    exec(code, {"__name__": "__main__", "__file__": argv[0]})
+                    returncode = 0
+                except SystemExit as e:
+                    if e.code is None or isinstance(e.code, int):
+                        returncode = e.code or 0
+                    else:
+                        print(e.code, file=sys.stderr)
+                        returncode = 1
+                except ImportError:
+                    raise
+                except Exception:
+                    traceback.print_exc()
+                    returncode = 1
+        finally:
+            sys.argv = saved_argv
+
+    return subprocess.CompletedProcess(
+        argv, returncode, stdout.getvalue(), stderr.getvalue()
+    )
+
+
+def test_gestalt_conversion(
+    gestalt_file: Path,
+    formats: Sequence[str] = _DEFAULT_TEST_FORMATS,
+    parallel: bool = True,
+) -> Dict[str, Any]:
     """
     Test a Gestalt file conversion to multiple formats.
 
+    The converted outputs are only checked and then discarded, so they are
+    written to tmpfs (/dev/shm) where available, else the default temp dir.
+
     Args:
         gestalt_file: Path to the Gestalt YAML file
+        formats: Output formats to convert to, empty to only validate
+        parallel: Run the validation and the conversions concurrently;
+            ignored when gestalt runs in process (ADL2GESTALT_IN_PROCESS=1)
 
     Returns:
         Dictionary with test results
@@ -118,25 +503,45 @@ def test_gestalt_conversion(gestalt_file: Path) -> Dict[str, Any]:
         "overall_success": False,
     }
 
-    # Validate the file
-    is_valid, error_msg = validate_gestalt_file(gestalt_file)
-    results["validation"] = {"valid": is_valid, "error": error_msg}
-
-    if not is_valid:
+    # Validation alone decides the outcome when no formats are requested
+    if not formats:
+        is_valid, error_msg = validate_gestalt_file(gestalt_file)
+        results["validation"] = {"valid": is_valid, "error": error_msg}
+        results["overall_success"] = is_valid
         return results
 
-    # Test conversions to different formats
-    formats_to_test = ["qt", "bob", "dm"]
-    # formats_to_test = ["qt"]
-
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
-
-        for fmt in formats_to_test:
-            output_file = temp_path / f"test_output.{fmt}"
-
-            success, message = run_gestalt_file(gestalt_file, fmt, output_file)
-
+    with tempfile.TemporaryDirectory(dir=_TMPFS_DIR) as temp_dir:
+        output_files = {fmt: Path(temp_dir) / f"test_output.{fmt}" for fmt in formats}
+
+        # Validation and conversions only read the Gestalt file, so they can
+        # overlap when gestalt runs in subprocesses; in-process runs swap
+        # sys.argv and the standard streams, so they must not race the parser
+        if parallel and not _in_process_enabled():
+            # Conversions of an invalid file are discarded below
+            with ThreadPoolExecutor(max_workers=len(output_files) + 1) as executor:
+                validation = executor.submit(validate_gestalt_file, gestalt_file)
+                runs = {
+                    fmt: executor.submit(
+                        run_gestalt_file, gestalt_file, fmt, output_file
+                    )
+                    for fmt, output_file in output_files.items()
+                }
+                is_valid, error_msg = validation.result()
+                outcomes = {fmt: run.result() for fmt, run in runs.items()}
+        else:
+            is_valid, error_msg = validate_gestalt_file(gestalt_file)
+            outcomes = {}
+            if is_valid:
+                for fmt, output_file in output_files.items():
+                    outcomes[fmt] = run_gestalt_file(gestalt_file, fmt, output_file)
+
+        results["validation"] = {"valid": is_valid, "error": error_msg}
+        if not is_valid:
+            return results
+
+        # Test conversions to different formats
+        for fmt, (success, message) in outcomes.items():
+            output_file = output_files[fmt]
             results["conversions"][fmt] = {
                 "success": success,
                 "message": message,
@@ -154,16 +559,126 @@ def test_gestalt_conversion(gestalt_file: Path) -> Dict[str, Any]:
     return results
 
 
+def batch_validate_gestalt_files(
+    folder: Path,
+    recursive: bool = True,
+    max_workers: Optional[int] = None,
+    formats: Sequence[str] = (),
+) -> List[Dict[str, Any]]:
+    """
+    Validate and test every Gestalt file in a folder in parallel.
+
+    Each file is handled by test_gestalt_conversion in a worker process,
+    so the per-file conversions run concurrently.
+
+    Args:
+        folder: Folder containing Gestalt YAML files
+        recursive: Whether to search subdirectories
+        max_workers: Number of worker processes, defaults to the CPU count
+        formats: Output formats to test, by default the files are only
+            validated
+
+    Returns:
+        List of test_gestalt_conversion results, in file order
+    """
+    from .scanner import list_gestalt_files
+
+    gestalt_files = list_gestalt_files(folder, recursive)
+    if not gestalt_files:
+        return []
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers or os.cpu_count(), initializer=_init_gestalt_worker
+    ) as executor:
+        results = list(
+            executor.map(
+                test_gestalt_conversion, gestalt_files, repeat(formats), chunksize=4
+            )
+        )
+
+    # Worker processes exit without saving, so record their results here
+    for gestalt_file, result in zip(gestalt_files, results):
+        validation = result["validation"]
+        _store_validation(gestalt_file, validation["valid"], validation["error"])
+
+    return results
+
+
+def _find_macros(path: Path) -> Set[str]:
+    """
+    Return the names of all macros referenced in a file.
+
+    The file is memory-mapped and scanned as bytes, so it is neither read
+    into memory as a whole nor decoded; only the macro names are decoded.
+    """
+    with open(path, "rb") as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return set()
+        with buffer:
+            return {name.decode("ascii") for name in _MACRO_RE.findall(buffer)}
+
+
+def _macro_test_value(macro: str) -> str:
+    """Pick a test value for a macro from the first matching name rule."""
+    macro_upper = macro.upper()
+    for substring, value in _DEFAULT_RULES:
+        if substring in macro_upper:
+            return value
+    if macro_upper in _NUMERIC_MACROS:
+        return "1"
+    return f"test_{macro.lower()}"
+
+
+def generate_test_data_for_gestalt(gestalt_file: Path) -> Dict[str, Any]:
+    """
+    Generate macro values for testing a Gestalt file.
+
+    Every {NAME} or ${NAME} macro referenced in the file gets a placeholder
+    value, on top of defaults for the common macros.
+
+    Args:
+        gestalt_file: Path to the Gestalt YAML file
+
+    Returns:
+        Dictionary mapping macro names to test values
+    """
+    test_data = {
+        macro: _macro_test_value(macro) for macro in _find_macros(gestalt_file)
+    }
+    return {**_DEFAULT_TEST_DATA, **test_data}
+
+
+def _init_gestalt_worker() -> None:
+    """Compile the gestalt script once per worker process."""
+    # gestalt itself is imported along with this module
+    gestalt_script = _GESTALT_DIR / "gestalt.py"
+    if Stylesheet is not None and gestalt_script.exists():
+        _load_gestalt_script(gestalt_script)
+
+
 def create_gestalt_workflow(
-    medm_file: Path, output_dir: Path, test_conversion: bool = True
+    medm_file: Path,
+    output_dir: Path,
+    test_conversion: bool = True,
+    parallel: bool = True,
 ) -> Dict[str, Any]:
     """
     Complete workflow: convert MEDM to Gestalt, validate, and test.
 
+    Successful tested runs are cached, and the cached result is returned
+    as long as the MEDM file, its Gestalt file and the files that includes
+    are unchanged. Messages of a cached result do not name the temporary
+    outputs of the original run.
+
     Args:
         medm_file: Path to MEDM ADL file
         output_dir: Directory for output files
         test_conversion: Whether to test the conversion
+        parallel: Validate and test the Gestalt file concurrently, see
+            test_gestalt_conversion
 
     Returns:
         Dictionary with workflow results
@@ -179,8 +694,14 @@ def create_gestalt_workflow(
     }
 
     try:
-        # Step 1: Convert MEDM to Gestalt
         gestalt_file = output_dir / f"{medm_file.stem}.yml"
+        if test_conversion:
+            # Nothing to redo if both files are unchanged since a successful run
+            cached = _WORKFLOW_CACHE.get(medm_file, gestalt_file)
+            if cached is not None:
+                return cached
+
+        # Step 1: Convert MEDM to Gestalt
         converter = MedmToGestaltConverter()
         gestalt_file = converter.convert_file(medm_file, gestalt_file)
 
@@ -192,12 +713,13 @@ def create_gestalt_workflow(
 
         if test_conversion:
             # Step 2: Validate and test the Gestalt file
-            test_results = test_gestalt_conversion(gestalt_file)
+            test_results = test_gestalt_conversion(gestalt_file, parallel=parallel)
 
             results["validation"] = test_results["validation"]
             results["testing"] = test_results["conversions"]
 
             results["overall_success"] = test_results["overall_success"]
+            _WORKFLOW_CACHE.put(medm_file, results)
         else:
             results["overall_success"] = True
 
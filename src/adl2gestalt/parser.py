@@ -33,6 +33,7 @@ parent GUI widget.
 
 import logging
 import pathlib
+import sys
 from collections import OrderedDict, namedtuple
 from typing import Any
 
@@ -184,8 +185,9 @@ class MedmBaseWidget:
         for line, text in enumerate(buf):
             if text.rstrip().endswith(" {"):
                 if nesting == level:
-                    symbol = text.strip()[:-2]
-                    block = Block(line, None, nesting, symbol.strip('"'))
+                    # Interned, so lookups in the widget tables compare by identity
+                    symbol = sys.intern(text.strip()[:-2].strip('"'))
+                    block = Block(line, None, nesting, symbol)
                 nesting += 1
             elif text.rstrip().endswith("}"):
                 nesting -= 1
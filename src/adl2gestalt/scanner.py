@@ -1,11 +1,17 @@
 """File scanning and conversion status utilities."""
 
+import heapq
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import repeat
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 
-def list_medm_files(folder: Path, recursive: bool = True) -> List[Path]:
+def list_medm_files(
+    folder: Path, recursive: bool = True, limit: Optional[int] = None
+) -> List[Path]:
     """
     Recursively find all .adl files in folder.
 
@@ -15,23 +21,23 @@ def list_medm_files(folder: Path, recursive: bool = True) -> List[Path]:
         Directory to search for MEDM files
     recursive : bool
         Whether to search subdirectories
+    limit : int, optional
+        Return only the first `limit` files in sorted order, without
+        sorting the whole listing. If None, all files are returned
 
     Returns
     -------
     List[Path]
-        List of paths to .adl files found
+        Sorted list of paths to .adl files found
     """
     folder = Path(folder)
     if not folder.exists():
         raise ValueError(f"Folder does not exist: {folder}")
 
-    if recursive:
-        pattern = "**/*.adl"
-    else:
-        pattern = "*.adl"
-
-    files = sorted(folder.glob(pattern))
-    return files
+    files = _walk(folder, (".adl",), recursive)
+    if limit is not None:
+        return heapq.nsmallest(limit, files)
+    return sorted(files)
 
 
 def list_gestalt_files(folder: Path, recursive: bool = True) -> List[Path]:
@@ -54,13 +60,39 @@ def list_gestalt_files(folder: Path, recursive: bool = True) -> List[Path]:
     if not folder.exists():
         raise ValueError(f"Folder does not exist: {folder}")
 
-    files = []
-    patterns = ["**/*.yml", "**/*.yaml"] if recursive else ["*.yml", "*.yaml"]
+    return sorted(_walk(folder, (".yml", ".yaml"), recursive))
 
-    for pattern in patterns:
-        files.extend(folder.glob(pattern))
 
-    return sorted(files)
+def _walk(folder: Path, suffixes: Tuple[str, ...], recursive: bool) -> Iterator[Path]:
+    """
+    Yield files under folder whose names end with one of suffixes.
+
+    Uses os.scandir with an explicit stack, so directory entries are
+    classified from the cached d_type instead of a stat() per entry.
+    Symlinked directories are not followed, and unreadable directories
+    are skipped.
+    """
+    stack = [os.fspath(folder)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        stack.append(entry.path)
+                elif entry.name.endswith(suffixes):
+                    yield Path(entry.path)
+
+
+def _safe_stat(path: Path) -> Optional[os.stat_result]:
+    """Return the stat result for path, or None if it cannot be stat'ed."""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
 
 
 def get_conversion_status(medm_file: Path, gestalt_folder: Path) -> Dict[str, Any]:
@@ -92,22 +124,24 @@ def get_conversion_status(medm_file: Path, gestalt_folder: Path) -> Dict[str, An
     # Find expected gestalt file path
     gestalt_file = gestalt_folder / medm_file.with_suffix(".yml").name
 
+    # One stat() per file gives both existence and modification time
+    medm_stat = _safe_stat(medm_file)
+    gestalt_stat = _safe_stat(gestalt_file)
+
     status = {
         "medm_file": medm_file,
         "gestalt_file": gestalt_file,
-        "exists": gestalt_file.exists(),
+        "exists": gestalt_stat is not None,
         "up_to_date": False,
         "medm_modified": None,
         "gestalt_modified": None,
         "status": "needs_conversion",  # Default to needs conversion
     }
 
-    if medm_file.exists():
-        medm_stat = medm_file.stat()
+    if medm_stat is not None:
         status["medm_modified"] = datetime.fromtimestamp(medm_stat.st_mtime)
 
-    if gestalt_file.exists():
-        gestalt_stat = gestalt_file.stat()
+    if gestalt_stat is not None:
         status["gestalt_modified"] = datetime.fromtimestamp(gestalt_stat.st_mtime)
 
         if status["medm_modified"] and status["gestalt_modified"]:
@@ -119,7 +153,10 @@ def get_conversion_status(medm_file: Path, gestalt_folder: Path) -> Dict[str, An
 
 
 def get_conversion_summary(
-    medm_folder: Path, gestalt_folder: Path, recursive: bool = True
+    medm_folder: Path,
+    gestalt_folder: Path,
+    recursive: bool = True,
+    max_workers: Optional[int] = None,
 ) -> Dict[str, Any]:
     """
     Get summary statistics for conversion status.
@@ -132,6 +169,9 @@ def get_conversion_summary(
         Root folder for Gestalt files
     recursive : bool
         Whether to search subdirectories
+    max_workers : int, optional
+        Number of threads used to stat the files. If None, uses the
+        ThreadPoolExecutor default
 
     Returns
     -------
@@ -148,9 +188,13 @@ def get_conversion_summary(
         "needs_conversion": [],  # No Gestalt file exists
     }
 
-    for medm_file in medm_files:
-        status = get_conversion_status(medm_file, gestalt_folder)
+    # The status checks are dominated by stat() calls, so run them in threads
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        statuses = list(
+            executor.map(get_conversion_status, medm_files, repeat(gestalt_folder))
+        )
 
+    for medm_file, status in zip(medm_files, statuses):
         if status["status"] == "converted":
             summary["converted"].append(medm_file)
             if status["up_to_date"]:
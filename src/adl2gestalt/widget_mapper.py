@@ -1,38 +1,57 @@
 """Widget mapping definitions from MEDM to Gestalt."""
 
+import sys
+from typing import Dict, Final, FrozenSet
+
+
+def _interned(mapping: Dict[str, str]) -> Dict[str, str]:
+    """Return mapping with interned keys, matching the parser's block symbols."""
+    return {sys.intern(key): value for key, value in mapping.items()}
+
 
 # MEDM widget to Gestalt widget type mapping
 # Based on official mapping from Gestalt author
-WIDGET_TYPE_MAP = {
-    # Graphics Objects
-    "arc": "Arc",
-    "image": "Image",
-    "line": "Polyline",
-    "oval": "Ellipse",
-    "polygon": "Polygon",
-    "polyline": "Polyline",
-    "rectangle": "Rectangle",
-    "text": "Text",
-    # Monitor Objects
-    "bar": "Scale",
-    "byte": "ByteMonitor",
-    "cartesian plot": None,  # No match in Gestalt
-    "meter": None,  # No match in Gestalt
-    "strip chart": None,  # No match in Gestalt
-    "text update": "TextMonitor",
-    "indicator": "Scale",  # indicator = Scale Monitor
-    # Controller Objects
-    "choice button": "ChoiceButton",
-    "menu": "Menu",
-    "message button": "MessageButton",
-    "related display": "RelatedDisplay",
-    "shell command": "ShellCommand",
-    "slider": "Slider",
-    "valuator": "Slider",
-    "text entry": "TextEntry",
-    "wheel switch": None,  # No match in Gestalt
-    # Special Objects
-    "composite": "Group",  # GroupNode & IncludeNode
-    # Display (main container) - maps to Form node
-    "display": "Form",
-}
+WIDGET_TYPE_MAP: Final[Dict[str, str]] = _interned(
+    {
+        # Graphics Objects
+        "arc": "Arc",
+        "image": "Image",
+        "line": "Polyline",
+        "oval": "Ellipse",
+        "polygon": "Polygon",
+        "polyline": "Polyline",
+        "rectangle": "Rectangle",
+        "text": "Text",
+        # Monitor Objects
+        "bar": "Scale",
+        "byte": "ByteMonitor",
+        "text update": "TextMonitor",
+        "indicator": "Scale",  # indicator = Scale Monitor
+        # Controller Objects
+        "choice button": "ChoiceButton",
+        "menu": "Menu",
+        "message button": "MessageButton",
+        "related display": "RelatedDisplay",
+        "shell command": "ShellCommand",
+        "slider": "Slider",
+        "valuator": "Slider",
+        "text entry": "TextEntry",
+        # Special Objects
+        "composite": "Group",  # GroupNode & IncludeNode
+        # Display (main container) - maps to Form node
+        "display": "Form",
+    }
+)
+
+# MEDM widgets with no match in Gestalt
+UNSUPPORTED_WIDGETS: Final[FrozenSet[str]] = frozenset(
+    map(
+        sys.intern,
+        {
+            "cartesian plot",
+            "meter",
+            "strip chart",
+            "wheel switch",
+        },
+    )
+)
@@ -3,13 +3,33 @@ Shared test configuration and fixtures for adl2gestalt tests.
 """
 
 import pytest
+from functools import lru_cache
 from pathlib import Path
 import tempfile
 import shutil
+from types import SimpleNamespace
 from typing import Dict, Any
+from unittest.mock import patch
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 # Test data directory
 TEST_DATA_DIR = Path(__file__).parent / "fixtures"
+SAMPLE_MEDM_FILE = TEST_DATA_DIR / "sample_medm.adl"
+SAMPLE_GESTALT_FILE = TEST_DATA_DIR / "sample_gestalt.yml"
+HAVE_SAMPLE_MEDM = SAMPLE_MEDM_FILE.exists()
+HAVE_SAMPLE_GESTALT = SAMPLE_GESTALT_FILE.exists()
+
+
+@pytest.fixture(autouse=True)
+def no_validation_cache(monkeypatch):
+    """Keep tests from reading or writing the user's validation cache."""
+    monkeypatch.setenv("ADL2GESTALT_NO_CACHE", "1")
 
 
 @pytest.fixture
@@ -19,19 +39,17 @@ def temp_dir():
         yield Path(tmpdir)
 
 
-@pytest.fixture
-def sample_medm_dir(temp_dir):
-    """Create a directory with sample MEDM files."""
-    medm_dir = temp_dir / "medm"
-    medm_dir.mkdir()
+@pytest.fixture(scope="session")
+def sample_medm_dir(tmp_path_factory):
+    """Create a directory with sample MEDM files, shared by all tests."""
+    medm_dir = tmp_path_factory.mktemp("medm")
     
     # Copy sample MEDM file
-    sample_medm = TEST_DATA_DIR / "sample_medm.adl"
-    if sample_medm.exists():
-        shutil.copy(sample_medm, medm_dir / "sample.adl")
+    if HAVE_SAMPLE_MEDM:
+        shutil.copy(SAMPLE_MEDM_FILE, medm_dir / "sample.adl")
     
     # Create additional test files
-    (medm_dir / "test1.adl").write_text("""
+    (medm_dir / "test1.adl").write_bytes(b"""
 file {
     name="test1.adl"
     version=030109
@@ -60,7 +78,7 @@ text {
 }
 """)
     
-    (medm_dir / "test2.adl").write_text("""
+    (medm_dir / "test2.adl").write_bytes(b"""
 file {
     name="test2.adl"
     version=030109
@@ -92,19 +110,17 @@ text {
     return medm_dir
 
 
-@pytest.fixture
-def sample_gestalt_dir(temp_dir):
-    """Create a directory with sample Gestalt files."""
-    gestalt_dir = temp_dir / "gestalt"
-    gestalt_dir.mkdir()
+@pytest.fixture(scope="session")
+def sample_gestalt_dir(tmp_path_factory):
+    """Create a directory with sample Gestalt files, shared by all tests."""
+    gestalt_dir = tmp_path_factory.mktemp("gestalt")
     
     # Copy sample Gestalt file
-    sample_gestalt = TEST_DATA_DIR / "sample_gestalt.yml"
-    if sample_gestalt.exists():
-        shutil.copy(sample_gestalt, gestalt_dir / "sample.yml")
+    if HAVE_SAMPLE_GESTALT:
+        shutil.copy(SAMPLE_GESTALT_FILE, gestalt_dir / "sample.yml")
     
     # Create additional test files
-    (gestalt_dir / "test1.yml").write_text("""
+    (gestalt_dir / "test1.yml").write_bytes(b"""
 Form: !Form
     title: "Test 1"
     margins: 5x5x5x5
@@ -114,7 +130,7 @@ Test_Text: !Text
     text: "Hello Test1"
 """)
     
-    (gestalt_dir / "test2.yml").write_text("""
+    (gestalt_dir / "test2.yml").write_bytes(b"""
 Form: !Form  
     title: "Test 2"
     margins: 5x5x5x5
@@ -132,9 +148,8 @@ def sample_test_data():
     """Load sample test data for Gestalt files."""
     test_data_file = TEST_DATA_DIR / "sample_data.yml"
     if test_data_file.exists():
-        import yaml
         with open(test_data_file, 'r') as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=SafeLoader)
     else:
         return {
             "PREFIX": "TEST:",
@@ -147,12 +162,7 @@ def sample_test_data():
 @pytest.fixture
 def mock_gestalt_success():
     """Mock successful gestalt execution."""
-    from unittest.mock import MagicMock, patch
-    
-    mock_result = MagicMock()
-    mock_result.returncode = 0
-    mock_result.stdout = "Success"
-    mock_result.stderr = ""
+    mock_result = SimpleNamespace(returncode=0, stdout=b"Success", stderr=b"")
     
     with patch('subprocess.run', return_value=mock_result) as mock_run:
         yield mock_run
@@ -161,12 +171,7 @@ def mock_gestalt_success():
 @pytest.fixture
 def mock_gestalt_failure():
     """Mock failed gestalt execution."""
-    from unittest.mock import MagicMock, patch
-    
-    mock_result = MagicMock()
-    mock_result.returncode = 1
-    mock_result.stdout = ""
-    mock_result.stderr = "Test error"
+    mock_result = SimpleNamespace(returncode=1, stdout=b"", stderr=b"Test error")
     
     with patch('subprocess.run', return_value=mock_result) as mock_run:
         yield mock_run
@@ -242,6 +247,10 @@ Test_Widget: !TextMonitor
     foreground: "#000000"
 '''
 
+# Encoded once for the helpers below, which write them as-is
+SAMPLE_MEDM_BYTES = SAMPLE_MEDM_CONTENT.encode("utf-8")
+SAMPLE_GESTALT_BYTES = SAMPLE_GESTALT_CONTENT.encode("utf-8")
+
 
 @pytest.fixture
 def sample_medm_content():
@@ -266,46 +275,42 @@ def pytest_configure(config):
     )
 
 
-def pytest_collection_modifyitems(config, items):
-    """Skip integration tests if gestalt package not available."""
-    skip_integration = pytest.mark.skip(reason="gestalt package not available")
-    
-    # Try to import gestalt to see if it's available
+@lru_cache(maxsize=None)
+def _gestalt_available() -> bool:
+    """Check once whether gestalt_runner could import the gestalt package."""
     try:
-        import sys
-        from pathlib import Path
-        
-        # Add src/gestalt to path temporarily
-        gestalt_path = Path(__file__).parent.parent / "src" / "gestalt"
-        if gestalt_path.exists():
-            sys.path.insert(0, str(gestalt_path))
-            import gestalt
-            gestalt_available = True
-        else:
-            gestalt_available = False
+        from adl2gestalt.gestalt_runner import Stylesheet
     except ImportError:
-        gestalt_available = False
+        return False
+
+    return Stylesheet is not None
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip integration tests if gestalt package not available."""
+    if _gestalt_available():
+        return
     
-    if not gestalt_available:
-        for item in items:
-            if "integration" in item.keywords:
-                item.add_marker(skip_integration)
+    skip_integration = pytest.mark.skip(reason="gestalt package not available")
+    for item in items:
+        if item.get_closest_marker("integration"):
+            item.add_marker(skip_integration)
 
 
 # Helper functions for tests
 def create_test_medm_file(path: Path, content: str = None) -> Path:
     """Create a test MEDM file with optional custom content."""
     if content is None:
-        content = SAMPLE_MEDM_CONTENT
-    
-    path.write_text(content)
+        path.write_bytes(SAMPLE_MEDM_BYTES)
+    else:
+        path.write_text(content)
     return path
 
 
 def create_test_gestalt_file(path: Path, content: str = None) -> Path:
     """Create a test Gestalt file with optional custom content.""" 
     if content is None:
-        content = SAMPLE_GESTALT_CONTENT
-    
-    path.write_text(content)
+        path.write_bytes(SAMPLE_GESTALT_BYTES)
+    else:
+        path.write_text(content)
     return path
\ No newline at end of file
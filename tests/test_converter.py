@@ -0,0 +1,224 @@
+"""
+Tests for MEDM to Gestalt conversion.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from adl2gestalt import converter as converter_module
+from adl2gestalt.converter import MedmToGestaltConverter
+from adl2gestalt.parser import Color, MedmMainWidget
+
+NESTED_GROUP_MEDM = """
+file {
+    name="nested.adl"
+    version=030109
+}
+display {
+    object {
+        x=0
+        y=0
+        width=400
+        height=300
+    }
+}
+"color map" {
+    ncolors=2
+    colors {
+        ffffff,
+        000000,
+    }
+}
+composite {
+    object {
+        x=10
+        y=10
+        width=200
+        height=200
+    }
+    "composite name"=""
+    children {
+        composite {
+            object {
+                x=20
+                y=30
+                width=100
+                height=100
+            }
+            "composite name"=""
+            children {
+                rectangle {
+                    object {
+                        x=25
+                        y=40
+                        width=5
+                        height=5
+                    }
+                    "basic attribute" {
+                        clr=1
+                    }
+                }
+            }
+        }
+    }
+}
+"""
+
+
+UNTITLED_TEXT_MEDM = """
+file {
+    name="untitled.adl"
+    version=030109
+}
+display {
+    object {
+        x=0
+        y=0
+        width=400
+        height=300
+    }
+}
+"color map" {
+    ncolors=2
+    colors {
+        ffffff,
+        000000,
+    }
+}
+text {
+    object {
+        x=10
+        y=10
+        width=100
+        height=20
+    }
+    "basic attribute" {
+        clr=1
+    }
+}
+"""
+
+
+@pytest.fixture
+def converter():
+    """Fresh converter instance."""
+    return MedmToGestaltConverter()
+
+
+class TestMedmExpressionConversion:
+    """Test conversion of MEDM calc expressions to Python syntax."""
+
+    @pytest.mark.parametrize(
+        "medm_expression, python_expression",
+        [
+            ("A#0", "A!=0"),
+            ("A=1", "A==1"),
+            ("A==1", "A==1"),
+            ("A>=1", "A>=1"),
+            ("A<=1", "A<=1"),
+            ("A=1&&B=2", "A==1 and B==2"),
+            ("A=1||B=2", "A==1 or B==2"),
+            ("!A", " not A"),
+        ],
+    )
+    def test_operators(self, converter, medm_expression, python_expression):
+        """Test that MEDM operators are mapped to Python operators."""
+        assert converter.convert_medm_to_python(medm_expression) == python_expression
+
+    def test_functions(self, converter):
+        """Test that MEDM functions are mapped as whole words only."""
+        result = converter.convert_medm_to_python("LOGE(A)+LOG(B)+ASIN(C)+SIN(D)")
+        assert result == "math.log(A)+math.log10(B)+math.asin(C)+math.sin(D)"
+
+    def test_empty_expression(self, converter):
+        """Test that an empty expression is returned unchanged."""
+        assert converter.convert_medm_to_python("") == ""
+
+    @pytest.mark.parametrize("medm_expression", ["A", "A+1", "(A-B)*2<C"])
+    def test_plain_expression(self, converter, medm_expression, monkeypatch):
+        """Test that expressions without MEDM-only tokens skip the substitution."""
+        token_re = MagicMock(wraps=converter_module._MEDM_TOKEN_RE)
+        monkeypatch.setattr(converter_module, "_MEDM_TOKEN_RE", token_re)
+        converter_module._convert_medm_to_python.cache_clear()
+
+        assert converter.convert_medm_to_python(medm_expression) == medm_expression
+        token_re.sub.assert_not_called()
+
+
+class TestColorMap:
+    """Test building Gestalt color aliases from the MEDM color table."""
+
+    def test_out_of_range_components(self, converter):
+        """Test that dl_color components outside 0..255 are clamped."""
+        converter.build_color_map([Color(18, 300, -1), Color(255, 0, 128)])
+
+        assert converter.color_aliases["_medm_color_0"] == "$12ff00"
+        assert converter.color_aliases["_medm_color_1"] == "$ff0080"
+
+    def test_color_reference(self, converter):
+        """Test resolving colors given as Color objects, indexes or junk."""
+        converter.build_color_map([Color(255, 255, 255), Color(0, 0, 0)])
+
+        assert converter.get_color_reference(Color(0, 0, 0), []) == "*medm_color_1"
+        assert converter.get_color_reference("1", []) == "*medm_color_1"
+        assert converter.get_color_reference(Color(1, 2, 3), []) == "$000000"
+        assert converter.get_color_reference(["unhashable"], []) == "$000000"
+
+
+class TestConvertMany:
+    """Test parallel conversion of several ADL files."""
+
+    def test_convert_many(self, tmp_path, sample_medm_content):
+        """Test that each ADL file is converted into the output directory."""
+        adl_files = []
+        for name in ("first", "second", "third"):
+            adl_file = tmp_path / f"{name}.adl"
+            adl_file.write_text(sample_medm_content)
+            adl_files.append(adl_file)
+
+        output_dir = tmp_path / "output"
+        results = MedmToGestaltConverter.convert_many(adl_files, output_dir, workers=2)
+
+        assert results == [output_dir / f"{f.stem}.yml" for f in adl_files]
+        for result in results:
+            content = result.read_text()
+            assert "Form: !Form" in content
+            assert 'pv: "TEST:DEVICE:VALUE"' in content
+
+
+class TestGroupConversion:
+    """Test conversion of composite widgets into Gestalt groups."""
+
+    def test_nested_group_geometry(self, tmp_path, converter):
+        """Test that children are placed relative to their enclosing group."""
+        adl_file = tmp_path / "nested.adl"
+        adl_file.write_text(NESTED_GROUP_MEDM)
+        medm = MedmMainWidget(str(adl_file))
+        medm.parseAdlBuffer(medm.getAdlLines())
+
+        lines = converter.convert_display(medm).splitlines()
+
+        assert "    geometry: 10x10x200x200" in lines
+        assert "            geometry: 10x20x100x100" in lines
+        assert "                    geometry: 5x10x5x5" in lines
+
+        # The parsed widgets keep their absolute geometry
+        inner_group = medm.widgets[0].widgets[0]
+        assert (inner_group.geometry.x, inner_group.geometry.y) == (20, 30)
+
+
+class TestTextConversion:
+    """Test conversion of MEDM text widgets."""
+
+    def test_untitled_text(self, tmp_path, converter):
+        """Test that a text widget without textix gets no text property."""
+        adl_file = tmp_path / "untitled.adl"
+        adl_file.write_text(UNTITLED_TEXT_MEDM)
+        medm = MedmMainWidget(str(adl_file))
+        medm.parseAdlBuffer(medm.getAdlLines())
+
+        content = converter.convert_display(medm)
+
+        assert "text_0: !Text" in content
+        assert "text:" not in content
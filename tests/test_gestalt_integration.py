@@ -2,19 +2,32 @@
 Tests for Gestalt integration functionality.
 """
 
-import pytest
+import sys
 import tempfile
 from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
 import yaml
-from unittest.mock import patch, MagicMock
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+from adl2gestalt import gestalt_runner
 from adl2gestalt.gestalt_runner import (
-    validate_gestalt_file,
-    run_gestalt_file,
-    test_gestalt_conversion,
+    _JsonCache,
+    _load_gestalt_script,
+    _run_gestalt_in_process,
+    _WorkflowCache,
+    batch_validate_gestalt_files,
+    create_gestalt_workflow,
     generate_test_data_for_gestalt,
-    create_gestalt_workflow
+    run_gestalt_file,
+    validate_gestalt_file,
 )
+from adl2gestalt.gestalt_runner import test_gestalt_conversion as run_conversion_test
 
 
 @pytest.fixture
@@ -142,6 +155,59 @@ class TestGestaltValidation:
         assert not is_valid
         assert "YAML parsing error" in error_msg
     
+    def test_validation_cache(self, tmp_path, monkeypatch):
+        """Test that results are reused until the file changes."""
+        monkeypatch.delenv("ADL2GESTALT_NO_CACHE")
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+        monkeypatch.setattr(gestalt_runner, "_VALIDATION_CACHE", _JsonCache("v.json"))
+        stylesheet = MagicMock()
+        stylesheet.parse.side_effect = lambda path, includes: yaml.safe_load(Path(path).read_text())
+        monkeypatch.setattr(gestalt_runner, "Stylesheet", stylesheet)
+        invalid_file = tmp_path / "invalid.yml"
+        invalid_file.write_text("invalid: yaml: content: [\n")
+
+        assert not validate_gestalt_file(invalid_file)[0]
+        with patch('adl2gestalt.gestalt_runner._validate_gestalt_file') as mock_validate:
+            assert not validate_gestalt_file(invalid_file)[0]
+            mock_validate.assert_not_called()
+
+            mock_validate.return_value = (True, None)
+            invalid_file.write_text("fixed: true\n")
+            assert validate_gestalt_file(invalid_file) == (True, None)
+
+        gestalt_runner._VALIDATION_CACHE.save()
+        assert _JsonCache("v.json").get(str(invalid_file))[3:] == [True, None]
+
+    def test_validation_cache_skips_fallback(self, tmp_path, monkeypatch):
+        """Test that YAML-only and unexpected-error results are not cached."""
+        monkeypatch.delenv("ADL2GESTALT_NO_CACHE")
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+        monkeypatch.setattr(gestalt_runner, "_VALIDATION_CACHE", _JsonCache("v.json"))
+        monkeypatch.setattr(gestalt_runner, "Stylesheet", None)
+        gestalt_file = tmp_path / "screen.yml"
+        gestalt_file.write_text("Form: !Form\n  margins: 5x5x5x5\n")
+
+        assert not validate_gestalt_file(gestalt_file)[0]
+        assert gestalt_runner._VALIDATION_CACHE.get(str(gestalt_file)) is None
+
+        stylesheet = MagicMock()
+        stylesheet.parse.side_effect = RuntimeError("widgets.yml not found")
+        monkeypatch.setattr(gestalt_runner, "Stylesheet", stylesheet)
+        assert validate_gestalt_file(gestalt_file)[1].startswith("Validation error")
+        assert gestalt_runner._VALIDATION_CACHE.get(str(gestalt_file)) is None
+
+    def test_cache_save_merges(self, tmp_path, monkeypatch):
+        """Test that saving keeps entries another process saved meanwhile."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+        ours, theirs = _JsonCache("v.json"), _JsonCache("v.json")
+        ours.get("a")
+        theirs.set("b", 2)
+        theirs.save()
+        ours.set("a", 1)
+        ours.save()
+
+        assert _JsonCache("v.json")._load() == {"a": 1, "b": 2}
+
     def test_validate_nonexistent_file(self, tmp_path):
         """Test validation of nonexistent file."""
         nonexistent = tmp_path / "nonexistent.yml"
@@ -160,8 +226,8 @@ class TestGestaltExecution:
         # Mock successful subprocess execution
         mock_result = MagicMock()
         mock_result.returncode = 0
-        mock_result.stdout = "Success"
-        mock_result.stderr = ""
+        mock_result.stdout = b"Success"
+        mock_result.stderr = b""
         mock_run.return_value = mock_result
         
         output_file = tmp_path / "output.ui"
@@ -177,8 +243,8 @@ class TestGestaltExecution:
         # Mock failed subprocess execution
         mock_result = MagicMock()
         mock_result.returncode = 1
-        mock_result.stdout = ""
-        mock_result.stderr = "Error message"
+        mock_result.stdout = b""
+        mock_result.stderr = b"Error message"
         mock_run.return_value = mock_result
         
         success, message = run_gestalt_file(sample_gestalt_file, "qt")
@@ -187,6 +253,44 @@ class TestGestaltExecution:
         assert "Gestalt execution failed" in message
         assert "Error message" in message
     
+    def test_run_gestalt_in_process(self, tmp_path, monkeypatch):
+        """Test running a gestalt script without a subprocess."""
+        # The runner adds the script directory to sys.path and keeps the
+        # compiled script; neither should outlive this test
+        monkeypatch.setattr(sys, "path", list(sys.path))
+        script = tmp_path / "gestalt.py"
+        script.write_text(
+            "import sys\n"
+            "print(' '.join(sys.argv[1:]))\n"
+            "print('warning', file=sys.stderr)\n"
+            "sys.exit(3)\n"
+        )
+        saved_argv = sys.argv
+
+        try:
+            result = _run_gestalt_in_process(script, ["-t", "qt", "test.yml"])
+        finally:
+            _load_gestalt_script.cache_clear()
+
+        assert result.returncode == 3
+        assert result.stdout == "-t qt test.yml\n"
+        assert result.stderr == "warning\n"
+        assert sys.argv is saved_argv
+
+    def test_run_gestalt_in_process_crash(self, tmp_path, monkeypatch):
+        """Test that a gestalt crash is reported instead of raised."""
+        monkeypatch.setattr(sys, "path", list(sys.path))
+        script = tmp_path / "gestalt.py"
+        script.write_text("raise RuntimeError('bad widget')\n")
+
+        try:
+            result = _run_gestalt_in_process(script, ["test.yml"])
+        finally:
+            _load_gestalt_script.cache_clear()
+
+        assert result.returncode == 1
+        assert "RuntimeError: bad widget" in result.stderr
+
     def test_run_gestalt_file_missing_script(self, sample_gestalt_file):
         """Test execution when gestalt script is missing."""
         # This should fail because gestalt.py doesn't exist at expected location
@@ -209,7 +313,7 @@ class TestGestaltTesting:
         # Mock conversion success for all formats
         mock_run.return_value = (True, "Success")
         
-        results = test_gestalt_conversion(sample_gestalt_file)
+        results = run_conversion_test(sample_gestalt_file)
         
         assert results["validation"]["valid"]
         assert results["overall_success"]
@@ -222,18 +326,56 @@ class TestGestaltTesting:
         for fmt_result in results["conversions"].values():
             assert fmt_result["success"]
     
+    @pytest.mark.parametrize("in_process, parallel", [("1", True), ("", False)])
+    @patch('adl2gestalt.gestalt_runner.validate_gestalt_file')
+    @patch('adl2gestalt.gestalt_runner.run_gestalt_file')
+    def test_test_gestalt_conversion_serial(self, mock_run, mock_validate, sample_gestalt_file, monkeypatch, in_process, parallel):
+        """Test that in-process and serial modes skip conversions of an invalid file."""
+        monkeypatch.setenv("ADL2GESTALT_IN_PROCESS", in_process)
+        mock_validate.return_value = (False, "Validation error")
+
+        results = run_conversion_test(sample_gestalt_file, parallel=parallel)
+
+        assert not results["overall_success"]
+        assert results["conversions"] == {}
+        mock_run.assert_not_called()
+
+    @patch('adl2gestalt.gestalt_runner.validate_gestalt_file')
+    @patch('adl2gestalt.gestalt_runner.run_gestalt_file')
+    def test_test_gestalt_conversion_validate_only(self, mock_run, mock_validate, sample_gestalt_file):
+        """Test that no conversions are run when no formats are requested."""
+        mock_validate.return_value = (True, None)
+
+        results = run_conversion_test(sample_gestalt_file, formats=())
+
+        assert results["overall_success"]
+        assert results["conversions"] == {}
+        mock_run.assert_not_called()
+
     @patch('adl2gestalt.gestalt_runner.validate_gestalt_file')
     def test_test_gestalt_conversion_validation_failure(self, mock_validate, sample_gestalt_file):
         """Test Gestalt conversion testing with validation failure."""
         # Mock validation failure
         mock_validate.return_value = (False, "Validation error")
         
-        results = test_gestalt_conversion(sample_gestalt_file)
+        results = run_conversion_test(sample_gestalt_file)
         
         assert not results["validation"]["valid"]
         assert not results["overall_success"]
         assert results["validation"]["error"] == "Validation error"
     
+    def test_batch_validate_gestalt_files(self, tmp_path):
+        """Test batch validation returns one result per file, in order."""
+        for name in ("b", "a"):
+            (tmp_path / f"{name}.yml").write_text("invalid: yaml: content: [\n")
+        (tmp_path / "empty").mkdir()
+
+        results = batch_validate_gestalt_files(tmp_path, recursive=False, max_workers=2)
+
+        assert [Path(r["file"]).name for r in results] == ["a.yml", "b.yml"]
+        assert not any(r["overall_success"] for r in results)
+        assert batch_validate_gestalt_files(tmp_path / "empty") == []
+
     def test_generate_test_data_for_gestalt(self, sample_gestalt_file):
         """Test generation of test data for Gestalt file."""
         test_data = generate_test_data_for_gestalt(sample_gestalt_file)
@@ -247,6 +389,16 @@ class TestGestaltTesting:
         assert test_data["PREFIX"] == "TEST:"
         assert test_data["DEVICE"] == "DEVICE01"
 
+    def test_generate_test_data_for_empty_file(self, tmp_path):
+        """Test that an empty file only gets the default test data."""
+        empty_file = tmp_path / "empty.yml"
+        empty_file.write_text("")
+
+        assert generate_test_data_for_gestalt(empty_file) == {
+            "PREFIX": "TEST:",
+            "DEVICE": "DEVICE01",
+        }
+
 
 class TestGestaltWorkflow:
     """Test complete Gestalt workflow functionality."""
@@ -277,6 +429,58 @@ class TestGestaltWorkflow:
         assert "#include widgets.yml" in content
         assert "!Form" in content
     
+    @patch('adl2gestalt.gestalt_runner.test_gestalt_conversion')
+    def test_create_gestalt_workflow_cache(self, mock_test, sample_medm_file, tmp_path, monkeypatch):
+        """Test that an unchanged successful workflow is not run again."""
+        monkeypatch.delenv("ADL2GESTALT_NO_CACHE")
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+        monkeypatch.setattr(gestalt_runner, "_WORKFLOW_CACHE", _WorkflowCache("w.json"))
+        monkeypatch.chdir(tmp_path)
+        mock_test.return_value = {
+            "validation": {"valid": True, "error": None},
+            "conversions": {
+                "qt": {
+                    "success": True,
+                    "message": "Successfully generated qt output to /dev/shm/tmp1/test_output.qt",
+                    "output_exists": True,
+                    "output_size": 100,
+                }
+            },
+            "overall_success": True,
+        }
+
+        output_dir = tmp_path / "output"
+        first = create_gestalt_workflow(sample_medm_file, output_dir)
+        second = create_gestalt_workflow(sample_medm_file, output_dir)
+
+        assert mock_test.call_count == 1
+        assert second["overall_success"]
+        assert second["conversion"] == first["conversion"]
+        assert second["validation"] == first["validation"]
+        # The temporary outputs of the first run are not named again
+        assert second["testing"]["qt"] == {
+            "success": True,
+            "message": "Successfully generated qt output (cached)",
+            "output_exists": False,
+            "output_size": 100,
+        }
+
+        # Touching the Gestalt file invalidates the cached result
+        gestalt_file = Path(first["conversion"]["gestalt_file"])
+        gestalt_file.write_text(gestalt_file.read_text() + "\n")
+        create_gestalt_workflow(sample_medm_file, output_dir)
+        assert mock_test.call_count == 2
+
+        # So does a change to the files it includes
+        (tmp_path / "colors.yml").write_text("red: $ff0000\n")
+        create_gestalt_workflow(sample_medm_file, output_dir)
+        assert mock_test.call_count == 3
+
+        # And a different adl2gestalt or gestalt version
+        monkeypatch.setattr(gestalt_runner, "_CACHE_VERSION", "0.0.0/none")
+        create_gestalt_workflow(sample_medm_file, output_dir)
+        assert mock_test.call_count == 4
+
     def test_create_gestalt_workflow_conversion_failure(self, tmp_path):
         """Test workflow with conversion failure."""
         # Create invalid MEDM file
@@ -329,5 +533,5 @@ class TestIntegration:
         
         # Verify it's valid YAML
         with open(gestalt_file, 'r') as f:
-            yaml_content = yaml.safe_load(f)
+            yaml_content = yaml.load(f, Loader=SafeLoader)
         assert yaml_content is not None
\ No newline at end of file